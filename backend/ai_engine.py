@@ -1,19 +1,56 @@
-from typing import List, Tuple, Optional, Set
+from typing import Iterable, List, Tuple, Optional, Set
 
 
 import re
+from collections import Counter
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 
+from tracing import span
+
 
 def _preprocess_text(text: str) -> str:
     # Very lightweight preprocessing to avoid heavy NLP deps
     return " ".join(text.lower().split())
 
 
-def _tokenize(text: str) -> Set[str]:
-    # Basic word tokenizer for keyword comparison
-    return set(re.findall(r"[a-zA-Z]{3,}", text.lower()))
+# Same token definition as scikit-learn's default (runs of 2+ word characters)
+_TOKEN_RE = re.compile(r"\w\w+")
+# Keywords stay letter-only, as before the shared tokenizer: "python3" -> "python", "c_sharp" -> "sharp"
+_KEYWORD_RE = re.compile(r"[a-z]{3,}")
+# Below this much room for resume + job text, compaction would strip them to nothing
+_MIN_PROMPT_CONTENT_TOKENS = 200
+
+
+def tokenize(text: str) -> List[str]:
+    """Single tokenization pass shared by TF-IDF vectorizing and keyword extraction.
+
+    Also usable directly as a `TfidfVectorizer(analyzer=...)` callable.
+    """
+    return _TOKEN_RE.findall(text.lower())
+
+
+def _pretokenized(counts: Counter) -> Iterable[str]:
+    # Analyzer for documents already run through `tokenize` and counted
+    return counts.elements()
+
+
+def _keyword_counts(counts: Counter) -> Counter:
+    """Letter-only keyword counts derived from the shared token stream."""
+    keywords: Counter = Counter()
+    for token, n in counts.items():
+        if token.isascii() and token.isalpha():
+            words = (token,) if len(token) > 2 else ()
+        else:
+            words = _KEYWORD_RE.findall(token)
+        for w in words:
+            if w not in _STOPWORDS:
+                keywords[w] += n
+    return keywords
+
+
+def _keywords(counts: Counter) -> Set[str]:
+    return set(_keyword_counts(counts))
 
 
 _STOPWORDS = {
@@ -43,43 +80,59 @@ def analyze_resume(resume_text: str) -> str:
     return cleaned
 
 
+def recommendation_for(score: float) -> str:
+    """Recommendation text shown with a match score."""
+    if score > 0.7:
+        return "Strong match. Consider shortlisting this candidate."
+    if score > 0.4:
+        return "Moderate match. Review manually for final decision."
+    return "Low match. Candidate may not fit this role closely."
+
+
 def compute_match_score(resume_text: str, job_description: str) -> Tuple[float, str, List[str], List[str]]:
-    resume_clean = _preprocess_text(resume_text)
-    job_clean = _preprocess_text(job_description)
+    # Tokenize each document once; the vectorizer and keyword sets share the counted stream
+    with span("match.tokenize", resume_chars=len(resume_text), job_chars=len(job_description)):
+        resume_tokens = Counter(tokenize(resume_text))
+        job_tokens = Counter(tokenize(job_description))
 
-    corpus = [resume_clean, job_clean]
-    vectorizer = TfidfVectorizer()
-    tfidf_matrix = vectorizer.fit_transform(corpus)
+    with span("match.tfidf"):
+        vectorizer = TfidfVectorizer(analyzer=_pretokenized)
+        tfidf_matrix = vectorizer.fit_transform([resume_tokens, job_tokens])
 
-    similarity_matrix = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])
-    score = float(similarity_matrix[0][0])
+        similarity_matrix = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])
+        score = float(similarity_matrix[0][0])
 
-    if score > 0.7:
-        recommendation = "Strong match. Consider shortlisting this candidate."
-    elif score > 0.4:
-        recommendation = "Moderate match. Review manually for final decision."
-    else:
-        recommendation = "Low match. Candidate may not fit this role closely."
+    recommendation = recommendation_for(score)
 
     # Compute simple missing keywords: words present in job description but not in resume
-    resume_words = _tokenize(resume_text)
-    job_words = _tokenize(job_description)
+    with span("match.keywords"):
+        resume_words = _keywords(resume_tokens)
+        job_words = _keywords(job_tokens)
 
-    missing = [
-        w
-        for w in sorted(job_words - resume_words)
-        if w not in _STOPWORDS and len(w) > 2
-    ][:50]
-
-    matched = [
-        w
-        for w in sorted(job_words & resume_words)
-        if w not in _STOPWORDS and len(w) > 2
-    ][:50]
+        missing = sorted(job_words - resume_words)[:50]
+        matched = sorted(job_words & resume_words)[:50]
 
     return score, recommendation, missing, matched
 
 
+def _build_interview_prompt(resume_text: str, job_description: str, exp: str, questions_per_category: int) -> str:
+    return (
+        "You are an assistant that creates concise interview questions with short model answers. "
+        "Input: a resume summary and a job description. Output MUST be valid JSON **only** with the following structure:\n\n"
+        '{ "candidate_experience_level": "<junior|mid|senior>",\n'
+        '  "categories": [\n'
+        '    {"category": "Technical depth", "questions": [{"question":"...","answer":"..."}]},\n'
+        '    {"category": "Problem-solving", "questions": [{"question":"...","answer":"..."}]},\n'
+        '    {"category": "Communication skills", "questions": [{"question":"...","answer":"..."}] }\n'
+        '  ]\n'
+        '}\n\n'
+        f"Use the candidate_experience_level: {exp}. Provide {questions_per_category} questions per category. "
+        "Make questions relevant to the resume and job description, and keep answers concise (1-3 sentences). "
+        "Do not include any extra commentary or text outside the JSON."
+        "\n\nResume summary:\n" + resume_text + "\n\nJob description:\n" + job_description
+    )
+
+
 def generate_interview_questions(resume_text: str, job_description: str, experience_level: Optional[str] = None, questions_per_category: int = 3) -> dict:
     """
     Generate interview questions and short model answers using OpenAI.
@@ -92,15 +145,21 @@ def generate_interview_questions(resume_text: str, job_description: str, experie
         {"category": "Problem-solving", "questions": [...]},
         {"category": "Communication skills", "questions": [...]}
       ],
-      "model_used": "gpt-3.5-turbo"
+      "model_used": "gpt-3.5-turbo",
+      "prompt_metadata": {"compacted": true, "prompt_tokens_before": 2400, "prompt_tokens_after": 1500, ...}
     }
+
+    While the OpenAI circuit breaker is open the result comes from the
+    fallback cache or templates and carries "fallback": "cache" | "template".
     """
     import logging
     import os
     import json
     logger = logging.getLogger(__name__)
     
+    import llm_guard
     from config import settings
+    from prompt_compaction import compact_for_prompt, estimate_tokens
     try:
         from openai import OpenAI
     except Exception as e:
@@ -115,12 +174,12 @@ def generate_interview_questions(resume_text: str, job_description: str, experie
     try:
         # Set API key as environment variable for OpenAI client
         os.environ["OPENAI_API_KEY"] = settings.OPENAI_API_KEY
-        client = OpenAI()
+        client = OpenAI(base_url=settings.OPENAI_BASE_URL or None)
     except TypeError as e:
         logger.error(f"TypeError initializing OpenAI client: {str(e)}")
         # Fallback: try with explicit api_key parameter
         try:
-            client = OpenAI(api_key=settings.OPENAI_API_KEY)
+            client = OpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL or None)
         except Exception as e2:
             logger.error(f"Failed to initialize OpenAI client: {str(e2)}")
             raise ValueError(f"Failed to initialize OpenAI client: {str(e2)}") from e2
@@ -129,33 +188,45 @@ def generate_interview_questions(resume_text: str, job_description: str, experie
 
     exp = experience_level or "mid"
 
-    prompt = (
-        "You are an assistant that creates concise interview questions with short model answers. "
-        "Input: a resume summary and a job description. Output MUST be valid JSON **only** with the following structure:\n\n"
-        '{ "candidate_experience_level": "<junior|mid|senior>",\n'
-        '  "categories": [\n'
-        '    {"category": "Technical depth", "questions": [{"question":"...","answer":"..."}]},\n'
-        '    {"category": "Problem-solving", "questions": [{"question":"...","answer":"..."}]},\n'
-        '    {"category": "Communication skills", "questions": [{"question":"...","answer":"..."}] }\n'
-        '  ]\n'
-        '}\n\n'
-        f"Use the candidate_experience_level: {exp}. Provide {questions_per_category} questions per category. "
-        "Make questions relevant to the resume and job description, and keep answers concise (1-3 sentences). "
-        "Do not include any extra commentary or text outside the JSON."
-        "\n\nResume summary:\n" + resume_text + "\n\nJob description:\n" + job_description
-    )
+    prompt = _build_interview_prompt(resume_text, job_description, exp, questions_per_category)
+    tokens_before = estimate_tokens(prompt)
+    compacted = False
+    if settings.INTERVIEW_PROMPT_COMPACTION and tokens_before > settings.INTERVIEW_PROMPT_TOKEN_BUDGET:
+        # Keep only the most relevant resume / job content within the budget
+        overhead = tokens_before - estimate_tokens(resume_text) - estimate_tokens(job_description)
+        content_budget = settings.INTERVIEW_PROMPT_TOKEN_BUDGET - overhead
+        if content_budget < _MIN_PROMPT_CONTENT_TOKENS:
+            logger.warning(
+                f"INTERVIEW_PROMPT_TOKEN_BUDGET={settings.INTERVIEW_PROMPT_TOKEN_BUDGET} leaves {content_budget} "
+                f"tokens after the {overhead}-token template; sending the prompt uncompacted"
+            )
+        else:
+            resume_compact, job_compact = compact_for_prompt(resume_text, job_description, content_budget)
+            prompt = _build_interview_prompt(resume_compact, job_compact, exp, questions_per_category)
+            compacted = True
+    prompt_metadata = {
+        "compacted": compacted,
+        "prompt_tokens_before": tokens_before,
+        "prompt_tokens_after": estimate_tokens(prompt),
+        "token_budget": settings.INTERVIEW_PROMPT_TOKEN_BUDGET,
+    }
+    logger.info(f"Estimated prompt tokens: {tokens_before} -> {prompt_metadata['prompt_tokens_after']}")
 
+    cache_key = llm_guard.cache_key(model, resume_text, job_description, exp, questions_per_category)
     try:
         logger.info(f"Calling OpenAI API with model: {model}")
-        resp = client.chat.completions.create(
-            model=model,
-            messages=[
-                {"role": "system", "content": "You are a helpful assistant that outputs valid JSON, and nothing else."},
-                {"role": "user", "content": prompt},
-            ],
-            temperature=0.2,
-            max_tokens=800,
-        )
+        with span("openai.chat.completions", kind="client", model=model, prompt_tokens=prompt_metadata["prompt_tokens_after"]):
+            # Deadline, circuit breaker and optional hedging (see llm_guard)
+            resp = llm_guard.chat_completion(
+                client,
+                model=model,
+                messages=[
+                    {"role": "system", "content": "You are a helpful assistant that outputs valid JSON, and nothing else."},
+                    {"role": "user", "content": prompt},
+                ],
+                temperature=0.2,
+                max_tokens=800,
+            )
         logger.info("OpenAI API call successful")
         
         content = resp.choices[0].message.content
@@ -170,8 +241,18 @@ def generate_interview_questions(resume_text: str, job_description: str, experie
             raise ValueError("OpenAI response did not include 'categories'.")
         
         parsed["model_used"] = model
+        usage = getattr(resp, "usage", None)
+        if usage is not None:
+            prompt_metadata["usage_prompt_tokens"] = usage.prompt_tokens
+        parsed["prompt_metadata"] = prompt_metadata
+        llm_guard.remember(cache_key, parsed)
         logger.info("Response validated and formatted")
         return parsed
+    except llm_guard.CircuitOpenError:
+        logger.warning("OpenAI circuit breaker open; serving fallback questions")
+        result = llm_guard.fallback_questions(cache_key, resume_text, job_description, exp, questions_per_category)
+        result["prompt_metadata"] = prompt_metadata
+        return result
     except json.JSONDecodeError as e:
         logger.error(f"Failed to parse JSON from OpenAI response: {str(e)}")
         raise ValueError("Failed to parse JSON from OpenAI response.") from e
@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+"""Benchmark the IVF index against exact search: recall@k vs query latency.
+
+Usage (from the backend folder):
+    python bench_dense_index.py --docs 50000 --queries 200 --k 10
+"""
+import argparse
+import json
+import time
+
+import numpy as np
+
+from dense_index import DenseMatcher
+
+_TOPICS = [
+    "python django flask api backend postgres redis celery",
+    "machine learning pytorch tensorflow model training feature engineering",
+    "react typescript frontend css webpack accessibility design",
+    "kubernetes docker terraform aws devops monitoring ci cd",
+    "data engineering spark airflow etl warehouse sql dbt",
+    "java spring microservices kafka jvm performance",
+    "ios swift android kotlin mobile app store",
+    "security penetration testing threat modelling siem incident response",
+    "product management roadmap stakeholder discovery analytics",
+    "sales account management crm negotiation pipeline quota",
+]
+_FILLER = "experienced engineer delivered projects collaborated across teams improved processes".split()
+
+
+def _synthetic_corpus(n_docs: int, seed: int):
+    rng = np.random.default_rng(seed)
+    topic_words = [t.split() for t in _TOPICS]
+    docs = []
+    for _ in range(n_docs):
+        main, side = rng.choice(len(topic_words), size=2, replace=False)
+        words = list(rng.choice(topic_words[main], size=40))
+        words += list(rng.choice(topic_words[side], size=10))
+        words += list(rng.choice(_FILLER, size=20))
+        rng.shuffle(words)
+        docs.append(" ".join(words))
+    return docs
+
+
+def _percentile(values, q):
+    return round(float(np.percentile(values, q)), 3)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--docs", type=int, default=20000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--components", type=int, default=128)
+    parser.add_argument("--lists", type=int, default=0, help="0 = sqrt(docs)")
+    parser.add_argument("--probes", default="1,2,4,8,16,32")
+    args = parser.parse_args()
+
+    docs = _synthetic_corpus(args.docs, seed=0)
+    queries = _synthetic_corpus(args.queries, seed=1)
+    matcher = DenseMatcher(args.components, args.lists, n_probe=1).fit(
+        [str(i) for i in range(len(docs))], docs
+    )
+    query_vecs = matcher.embed(queries)
+
+    exact_hits, exact_ms = [], []
+    for q in query_vecs:
+        started = time.perf_counter()
+        hits = matcher.index.exact_search(q, args.k)
+        exact_ms.append((time.perf_counter() - started) * 1000)
+        exact_hits.append({rid for rid, _ in hits})
+
+    report = {
+        "build": matcher.stats,
+        "exact": {"p50_ms": _percentile(exact_ms, 50), "p99_ms": _percentile(exact_ms, 99)},
+        "ivf": [],
+    }
+    for n_probe in (int(p) for p in args.probes.split(",")):
+        latencies, recall = [], []
+        for q, truth in zip(query_vecs, exact_hits):
+            started = time.perf_counter()
+            hits = matcher.index.search(q, args.k, n_probe)
+            latencies.append((time.perf_counter() - started) * 1000)
+            recall.append(len(truth & {rid for rid, _ in hits}) / max(len(truth), 1))
+        report["ivf"].append({
+            "n_probe": n_probe,
+            f"recall@{args.k}": round(float(np.mean(recall)), 4),
+            "p50_ms": _percentile(latencies, 50),
+            "p99_ms": _percentile(latencies, 99),
+        })
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
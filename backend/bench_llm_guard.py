@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+"""Exercise the OpenAI deadline / circuit breaker / hedging against the stub server.
+
+Scenarios (each with a fresh breaker):
+  healthy      steady latency
+  slow_tail    a share of very slow responses, without and with hedged requests
+  outage       every call fails: the breaker opens and callers get fallback questions fast
+  recovery     upstream healthy again: after the reset window a probe closes the breaker
+
+Usage (from the backend folder):
+    python bench_llm_guard.py --calls 200 --concurrency 16
+"""
+import argparse
+import json
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import ai_engine
+import llm_guard
+from bench_tokenizer import _document
+from config import settings
+from fake_openai import FakeOpenAIServer
+
+
+def _percentile(values, q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))] if ordered else 0.0
+
+
+def _call(resume: str, job: str) -> tuple:
+    started = time.perf_counter()
+    try:
+        result = ai_engine.generate_interview_questions(resume, job, "mid", 2)
+        outcome = result.get("fallback") or "ok"
+    except ValueError:
+        outcome = "error"
+    return outcome, (time.perf_counter() - started) * 1000
+
+
+def _run(name: str, pairs, concurrency: int) -> dict:
+    llm_guard.breaker = llm_guard.CircuitBreaker(
+        settings.OPENAI_BREAKER_FAILURE_THRESHOLD, settings.OPENAI_BREAKER_RESET_SECONDS
+    )
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(lambda pair: _call(*pair), pairs))
+    latencies = [ms for _, ms in results]
+    outcomes = {}
+    for outcome, _ in results:
+        outcomes[outcome] = outcomes.get(outcome, 0) + 1
+    return {
+        "scenario": name,
+        "calls": len(results),
+        "outcomes": outcomes,
+        "p50_ms": round(_percentile(latencies, 0.5), 1),
+        "p99_ms": round(_percentile(latencies, 0.99), 1),
+        "breaker_state": llm_guard.breaker.state,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--latency-ms", type=float, default=100)
+    parser.add_argument("--slow-rate", type=float, default=0.05)
+    parser.add_argument("--slow-ms", type=float, default=3000)
+    parser.add_argument("--hedge-after-ms", type=int, default=300)
+    args = parser.parse_args()
+
+    server = FakeOpenAIServer().start()
+    settings.OPENAI_API_KEY = settings.OPENAI_API_KEY or "test-key"
+    settings.OPENAI_BASE_URL = server.base_url
+    settings.OPENAI_TIMEOUT_SECONDS = 2.0
+    settings.OPENAI_BREAKER_SLOW_CALL_SECONDS = 1.0
+    settings.OPENAI_BREAKER_RESET_SECONDS = 1.0
+    # The slow tail alone should not trip the breaker in these runs
+    settings.OPENAI_BREAKER_FAILURE_THRESHOLD = max(settings.OPENAI_BREAKER_FAILURE_THRESHOLD, args.concurrency)
+
+    rng = random.Random(0)
+    pairs = [(_document(rng, 1500), _document(rng, 800)) for _ in range(args.calls)]
+    reports = []
+    try:
+        server.config.update({"latency_ms": args.latency_ms, "jitter_ms": args.latency_ms / 4})
+        reports.append(_run("healthy", pairs, args.concurrency))
+
+        server.config.update({"slow_rate": args.slow_rate, "slow_ms": args.slow_ms})
+        settings.OPENAI_HEDGE_AFTER_MS = 0
+        reports.append(_run("slow_tail", pairs, args.concurrency))
+        settings.OPENAI_HEDGE_AFTER_MS = args.hedge_after_ms
+        reports.append(_run("slow_tail_hedged", pairs, args.concurrency))
+        settings.OPENAI_HEDGE_AFTER_MS = 0
+
+        settings.OPENAI_BREAKER_FAILURE_THRESHOLD = 5
+        server.config.update({"slow_rate": 0, "error_rate": 1.0})
+        reports.append(_run("outage", pairs, args.concurrency))
+
+        server.config.update({"error_rate": 0})
+        breaker = llm_guard.breaker
+        time.sleep(settings.OPENAI_BREAKER_RESET_SECONDS)
+        outcome, ms = _call(*pairs[0])
+        reports.append({"scenario": "recovery", "probe": outcome, "probe_ms": round(ms, 1), "breaker_state": breaker.state})
+    finally:
+        server.stop()
+    print(json.dumps(reports, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+"""Benchmark match-scoring throughput: threadpool vs warm process pools of 1..N workers.
+
+Usage (from the backend folder):
+    python bench_scoring_executor.py --requests 400 --max-processes 8
+"""
+import argparse
+import json
+import os
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import cpu_executor
+from bench_tokenizer import _document
+
+
+def _throughput(executor, pairs) -> float:
+    started = time.perf_counter()
+    for future in [executor.submit(cpu_executor.score_match, r, j) for r, j in pairs]:
+        future.result()
+    return len(pairs) / (time.perf_counter() - started)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--max-processes", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--threads", type=int, default=40, help="AnyIO's default threadpool size")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    pairs = [
+        (_document(rng, rng.randint(2048, 10240)), _document(rng, rng.randint(2048, 10240)))
+        for _ in range(args.requests)
+    ]
+
+    with ThreadPoolExecutor(max_workers=args.threads) as threads:
+        _throughput(threads, pairs[:20])  # warm-up
+        thread_rps = _throughput(threads, pairs)
+
+    counts = sorted({1, *[2 ** i for i in range(1, 8) if 2 ** i < args.max_processes], args.max_processes})
+    process_runs = []
+    for count in counts:
+        pool = cpu_executor.create_pool(count)
+        try:
+            rps = _throughput(pool, pairs)
+        finally:
+            pool.shutdown()
+        process_runs.append({"processes": count, "requests_per_second": round(rps, 1)})
+
+    base = process_runs[0]["requests_per_second"]
+    for run in process_runs:
+        run["speedup"] = round(run["requests_per_second"] / base, 2)
+        run["efficiency"] = round(run["speedup"] / run["processes"], 2)
+
+    print(json.dumps({
+        "cpu_count": os.cpu_count(),
+        "requests": args.requests,
+        "threadpool": {"threads": args.threads, "requests_per_second": round(thread_rps, 1)},
+        "process_pool": process_runs,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
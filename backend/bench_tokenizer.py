@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+"""Micro-benchmark: legacy three-pass scoring vs the single-pass tokenizer.
+
+Reports CPU time and peak traced allocations per `compute_match_score` call
+on 2-10 KB resume / job description pairs.
+
+Usage (from the backend folder):
+    python bench_tokenizer.py --pairs 200
+"""
+import argparse
+import json
+import random
+import re
+import time
+import tracemalloc
+
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.metrics.pairwise import cosine_similarity
+
+import ai_engine
+
+_WORDS = (
+    "python java react kubernetes docker aws terraform sql postgres redis kafka spark airflow "
+    "machine learning pytorch tensorflow api microservices backend frontend testing ci cd "
+    "led team delivered designed implemented improved reduced latency scaled platform 2019 2021 "
+    "senior engineer developer analyst stakeholders agile scrum roadmap mentoring"
+).split()
+
+
+def _legacy_compute_match_score(resume_text: str, job_description: str):
+    # Verbatim copy of the pre-unification pipeline, kept here as the baseline
+    resume_clean = " ".join(resume_text.lower().split())
+    job_clean = " ".join(job_description.lower().split())
+    tfidf_matrix = TfidfVectorizer().fit_transform([resume_clean, job_clean])
+    score = float(cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])[0][0])
+    resume_words = set(re.findall(r"[a-zA-Z]{3,}", resume_text.lower()))
+    job_words = set(re.findall(r"[a-zA-Z]{3,}", job_description.lower()))
+    stop = ai_engine._STOPWORDS
+    missing = [w for w in sorted(job_words - resume_words) if w not in stop and len(w) > 2][:50]
+    matched = [w for w in sorted(job_words & resume_words) if w not in stop and len(w) > 2][:50]
+    return score, missing, matched
+
+
+def _document(rng: random.Random, size_bytes: int) -> str:
+    words = []
+    length = 0
+    while length < size_bytes:
+        word = rng.choice(_WORDS)
+        words.append(word.capitalize() if rng.random() < 0.1 else word)
+        length += len(word) + 1
+        if rng.random() < 0.08:
+            words.append(".\n")
+    return " ".join(words)
+
+
+def _measure(fn, pairs):
+    fn(*pairs[0])  # warm-up
+    cpu_started = time.process_time()
+    for resume, job in pairs:
+        fn(resume, job)
+    cpu_us = (time.process_time() - cpu_started) / len(pairs) * 1e6
+
+    peaks = []
+    for resume, job in pairs[:50]:
+        tracemalloc.start()
+        fn(resume, job)
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    return {"cpu_us_per_call": round(cpu_us, 1), "peak_alloc_kb": round(sum(peaks) / len(peaks) / 1024, 1)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pairs", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    pairs = [
+        (_document(rng, rng.randint(2048, 10240)), _document(rng, rng.randint(2048, 10240)))
+        for _ in range(args.pairs)
+    ]
+    legacy = _measure(_legacy_compute_match_score, pairs)
+    unified = _measure(ai_engine.compute_match_score, pairs)
+    print(json.dumps({
+        "pairs": args.pairs,
+        "legacy": legacy,
+        "single_pass": unified,
+        "cpu_speedup": round(legacy["cpu_us_per_call"] / unified["cpu_us_per_call"], 2),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -17,6 +17,7 @@ class Settings:
     EMAIL_PORT: int = int(os.getenv("EMAIL_PORT", "587"))
     EMAIL_USER: str = os.getenv("EMAIL_USER", "")
     EMAIL_PASS: str = os.getenv("EMAIL_PASS", "").strip('"\'')  # Remove quotes if present
+    EMAIL_USE_TLS: bool = os.getenv("EMAIL_USE_TLS", "true").lower() in ("1", "true", "yes")
     JWT_SECRET: str = os.getenv("JWT_SECRET", "change_me")
     JWT_ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = int(
@@ -27,6 +28,82 @@ class Settings:
     # OpenAI configuration (set via environment variables, do NOT commit keys to source)
     OPENAI_API_KEY: str = os.getenv("OPENAI_API_KEY", "")
     OPENAI_MODEL: str = os.getenv("OPENAI_MODEL", "gpt-3.5-turbo")
+    OPENAI_BASE_URL: str = os.getenv("OPENAI_BASE_URL", "")  # e.g. a local OpenAI-compatible server
+    OPENAI_TIMEOUT_SECONDS: float = float(os.getenv("OPENAI_TIMEOUT_SECONDS", "20"))
+    OPENAI_BREAKER_FAILURE_THRESHOLD: int = int(os.getenv("OPENAI_BREAKER_FAILURE_THRESHOLD", "5"))
+    OPENAI_BREAKER_SLOW_CALL_SECONDS: float = float(os.getenv("OPENAI_BREAKER_SLOW_CALL_SECONDS", "10"))
+    OPENAI_BREAKER_RESET_SECONDS: float = float(os.getenv("OPENAI_BREAKER_RESET_SECONDS", "30"))
+    OPENAI_HEDGE_AFTER_MS: int = int(os.getenv("OPENAI_HEDGE_AFTER_MS", "0"))  # 0 = no hedged requests
+    OPENAI_HEDGE_MAX_INFLIGHT: int = int(os.getenv("OPENAI_HEDGE_MAX_INFLIGHT", "4"))
+    OPENAI_FALLBACK_CACHE_SIZE: int = int(os.getenv("OPENAI_FALLBACK_CACHE_SIZE", "512"))
+    # Compact resume / job description text so interview prompts stay under this many tokens
+    INTERVIEW_PROMPT_COMPACTION: bool = os.getenv("INTERVIEW_PROMPT_COMPACTION", "true").lower() in ("1", "true", "yes")
+    INTERVIEW_PROMPT_TOKEN_BUDGET: int = int(os.getenv("INTERVIEW_PROMPT_TOKEN_BUDGET", "1500"))
+
+    # Dense (LSA) embedding mode with an in-process approximate nearest-neighbour index
+    DENSE_INDEX_ENABLED: bool = os.getenv("DENSE_INDEX_ENABLED", "false").lower() in ("1", "true", "yes")
+    DENSE_INDEX_PATH: str = os.getenv(
+        "DENSE_INDEX_PATH", str(Path(__file__).parent / "data" / "dense_index.pkl")
+    )
+    DENSE_N_COMPONENTS: int = int(os.getenv("DENSE_N_COMPONENTS", "256"))
+    DENSE_N_LISTS: int = int(os.getenv("DENSE_N_LISTS", "0"))  # 0 = sqrt(number of resumes)
+    DENSE_N_PROBE: int = int(os.getenv("DENSE_N_PROBE", "8"))
+
+    # Background job queue (local SQLite, no external broker)
+    JOB_QUEUE_PATH: str = os.getenv(
+        "JOB_QUEUE_PATH", str(Path(__file__).parent / "data" / "jobs.sqlite3")
+    )
+    # Per uvicorn worker process; with `uvicorn --workers N` set 0 and run `python job_queue.py`
+    JOB_WORKERS: int = int(os.getenv("JOB_WORKERS", "1"))  # 0 = run workers separately
+    JOB_POLL_INTERVAL_SECONDS: float = float(os.getenv("JOB_POLL_INTERVAL_SECONDS", "0.5"))
+    JOB_LEASE_SECONDS: int = int(os.getenv("JOB_LEASE_SECONDS", "300"))
+    JOB_MAX_ITEMS: int = int(os.getenv("JOB_MAX_ITEMS", "10000"))
+
+    # Memory-mapped resume vector store shared by all uvicorn workers
+    VECTOR_STORE_ENABLED: bool = os.getenv("VECTOR_STORE_ENABLED", "false").lower() in ("1", "true", "yes")
+    VECTOR_STORE_DIR: str = os.getenv(
+        "VECTOR_STORE_DIR", str(Path(__file__).parent / "data" / "vectors")
+    )
+    VECTOR_STORE_SHARD_ROWS: int = int(os.getenv("VECTOR_STORE_SHARD_ROWS", "50000"))
+    VECTOR_STORE_MAX_SMALL_SHARDS: int = int(os.getenv("VECTOR_STORE_MAX_SMALL_SHARDS", "32"))
+
+    # PDF text extraction: backends tried in order, falling back on empty/garbled text
+    PDF_BACKENDS: str = os.getenv("PDF_BACKENDS", "pypdfium2,pdfminer,pypdf2")
+    PDF_MIN_TEXT_QUALITY: float = float(os.getenv("PDF_MIN_TEXT_QUALITY", "0.85"))
+
+    # Batch interview-question generation
+    INTERVIEW_BATCH_MAX_CONCURRENCY: int = int(os.getenv("INTERVIEW_BATCH_MAX_CONCURRENCY", "8"))
+    INTERVIEW_BATCH_MAX_ITEMS: int = int(os.getenv("INTERVIEW_BATCH_MAX_ITEMS", "200"))
+    INTERVIEW_BATCH_DEADLINE_SECONDS: float = float(os.getenv("INTERVIEW_BATCH_DEADLINE_SECONDS", "120"))
+
+    # Where CPU-bound match scoring runs: "thread" (AnyIO threadpool) or "process" (warm process pool)
+    SCORING_EXECUTOR: str = os.getenv("SCORING_EXECUTOR", "thread").lower()
+    # Per uvicorn worker; 0 = CPU cores / WEB_CONCURRENCY, so all workers' pools together fill the host
+    SCORING_PROCESSES: int = int(os.getenv("SCORING_PROCESSES", "0"))
+    # Number of uvicorn workers (the variable uvicorn itself reads for --workers)
+    WEB_CONCURRENCY: int = int(os.getenv("WEB_CONCURRENCY", "1"))
+
+    # Persisted match history, written in batches off the request path
+    MATCH_HISTORY_ENABLED: bool = os.getenv("MATCH_HISTORY_ENABLED", "true").lower() in ("1", "true", "yes")
+    MATCH_HISTORY_BATCH_SIZE: int = int(os.getenv("MATCH_HISTORY_BATCH_SIZE", "500"))
+    MATCH_HISTORY_FLUSH_SECONDS: float = float(os.getenv("MATCH_HISTORY_FLUSH_SECONDS", "1.0"))
+    MATCH_HISTORY_QUEUE_SIZE: int = int(os.getenv("MATCH_HISTORY_QUEUE_SIZE", "100000"))
+
+    # Event-loop watchdog: log and count callbacks that block the loop longer than the threshold
+    LOOP_WATCHDOG_ENABLED: bool = os.getenv("LOOP_WATCHDOG_ENABLED", "false").lower() in ("1", "true", "yes")
+    LOOP_WATCHDOG_INTERVAL_MS: int = int(os.getenv("LOOP_WATCHDOG_INTERVAL_MS", "50"))
+    LOOP_WATCHDOG_THRESHOLD_MS: int = int(os.getenv("LOOP_WATCHDOG_THRESHOLD_MS", "100"))
+
+    # Request tracing: sampled spans exported to a JSON-lines file or an OTLP/HTTP collector
+    TRACE_ENABLED: bool = os.getenv("TRACE_ENABLED", "false").lower() in ("1", "true", "yes")
+    TRACE_SAMPLE_RATE: float = float(os.getenv("TRACE_SAMPLE_RATE", "0.1"))
+    TRACE_EXPORTER: str = os.getenv("TRACE_EXPORTER", "jsonl")  # "jsonl" or "otlp"
+    TRACE_EXPORT_PATH: str = os.getenv(
+        "TRACE_EXPORT_PATH", str(Path(__file__).parent / "data" / "traces.jsonl")
+    )
+    TRACE_OTLP_ENDPOINT: str = os.getenv("TRACE_OTLP_ENDPOINT", "http://localhost:4318/v1/traces")
+    TRACE_SERVICE_NAME: str = os.getenv("TRACE_SERVICE_NAME", "smarthire-backend")
+    TRACE_EXPORT_INTERVAL_SECONDS: float = float(os.getenv("TRACE_EXPORT_INTERVAL_SECONDS", "1.0"))
 
 
 settings = Settings()
@@ -0,0 +1,127 @@
+"""
+Executor for CPU-bound match scoring.
+
+In the default `thread` mode scoring runs on the AnyIO threadpool like any
+sync route, so it serializes on the GIL. With SCORING_EXECUTOR=process it is
+dispatched to a warm process pool: each worker imports scikit-learn and
+loads the dense-index state once at start-up, and only the small score dict
+travels back. I/O-bound routes keep using the threadpool. If a worker dies
+(OOM kill, native crash) the pool is rebuilt and the request retried once.
+"""
+import asyncio
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional
+
+from starlette.concurrency import run_in_threadpool
+
+import ai_engine
+import dense_index
+import metrics
+import tracing
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_processes = 0
+_pool_lock = threading.Lock()
+
+
+def score_match(resume_text: str, job_description: str) -> dict:
+    score, recommendation, missing, matched = ai_engine.compute_match_score(resume_text, job_description)
+    semantic_score = None
+    if settings.DENSE_INDEX_ENABLED:
+        # Optional extra signal: never let it fail the core match
+        try:
+            matcher = dense_index.get_dense_matcher()
+            if matcher is not None:
+                semantic_score = matcher.similarity(resume_text, job_description)
+        except Exception as e:
+            metrics.inc("semantic_score_errors_total")
+            logger.warning(f"Semantic score unavailable: {type(e).__name__}: {e}")
+    return {
+        "score": score,
+        "recommendation": recommendation,
+        "missing_keywords": missing,
+        "matched_keywords": matched,
+        "semantic_score": semantic_score,
+    }
+
+
+def _warm_worker() -> None:
+    # Pay imports and model loading once per worker instead of on the first request
+    score_match("warm up resume python", "warm up job python")
+
+
+def _noop() -> int:
+    return os.getpid()
+
+
+def create_pool(processes: int) -> ProcessPoolExecutor:
+    pool = ProcessPoolExecutor(
+        max_workers=processes,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_warm_worker,
+    )
+    # Start every worker now so the first requests do not pay process spawn + warm-up
+    for future in [pool.submit(_noop) for _ in range(processes)]:
+        future.result()
+    return pool
+
+
+def start() -> None:
+    global _pool, _pool_processes
+    if settings.SCORING_EXECUTOR != "process" or _pool is not None:
+        return
+    # Every uvicorn worker starts its own pool; split the cores between them
+    processes = settings.SCORING_PROCESSES or max(1, (os.cpu_count() or 1) // max(1, settings.WEB_CONCURRENCY))
+    logger.info(f"Starting scoring process pool with {processes} workers")
+    _pool_processes = processes
+    _pool = create_pool(processes)
+
+
+def shutdown() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(cancel_futures=True)
+            _pool = None
+
+
+def _replace_pool(broken: ProcessPoolExecutor) -> Optional[ProcessPoolExecutor]:
+    """Swap a broken pool for a fresh one; callers that hit the same broken pool share one rebuild."""
+    global _pool
+    with _pool_lock:
+        if _pool is broken:
+            metrics.inc("scoring_pool_rebuilds_total")
+            logger.warning(f"Scoring process pool is broken; restarting {_pool_processes} workers")
+            broken.shutdown(wait=False, cancel_futures=True)
+            _pool = create_pool(_pool_processes)
+        return _pool
+
+
+async def score(resume_text: str, job_description: str) -> dict:
+    pool = _pool
+    if pool is None:
+        with tracing.span("match.score", executor="thread"):
+            return await run_in_threadpool(score_match, resume_text, job_description)
+    loop = asyncio.get_running_loop()
+    # The worker runs under a child span of the caller's and returns its spans with the result
+    call = (tracing.run_remote, tracing.inject(), "match.score", score_match, resume_text, job_description)
+    try:
+        result, spans = await loop.run_in_executor(pool, *call)
+    except BrokenProcessPool:
+        metrics.inc("scoring_pool_broken_total")
+        # Rebuilding spawns and warms processes: keep it off the event loop
+        pool = await run_in_threadpool(_replace_pool, pool)
+        if pool is None:  # shut down meanwhile
+            with tracing.span("match.score", executor="thread"):
+                return await run_in_threadpool(score_match, resume_text, job_description)
+        result, spans = await loop.run_in_executor(pool, *call)
+    tracing.record_spans(spans)
+    return result
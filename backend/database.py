@@ -3,7 +3,10 @@ from sqlalchemy.orm import sessionmaker, declarative_base
 
 from config import settings
 
-engine = create_engine(settings.DATABASE_URL, pool_pre_ping=True)
+# SQLite (local runs and load tests) needs cross-thread connections for FastAPI's threadpool
+connect_args = {"check_same_thread": False} if settings.DATABASE_URL.startswith("sqlite") else {}
+
+engine = create_engine(settings.DATABASE_URL, pool_pre_ping=True, connect_args=connect_args)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
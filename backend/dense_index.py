@@ -0,0 +1,304 @@
+"""
+Dense (LSA) embeddings for stored resumes with an in-process IVF index.
+
+TF-IDF vectors are reduced to float32 embeddings with TruncatedSVD, which
+folds co-occurring terms ("ml engineer" / "machine learning developer") onto
+shared dimensions. The embeddings are bucketed with spherical k-means into
+an inverted-file (IVF) index built on NumPy; a query only scores the
+`n_probe` closest buckets, trading recall for latency.
+
+The published index is a small pickle (SVD model, centroids, list offsets)
+plus `.npy` files for the embeddings and ids that every worker memory-maps,
+so the page cache holds one copy. An index fitted from the vector store
+records the store's vocabulary id and is ignored once the store has been
+rebuilt with a different vocabulary.
+"""
+import glob
+import json
+import logging
+import os
+import pickle
+import threading
+import time
+import uuid
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+
+import metrics
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def _normalize(x: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(x, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (x / norms).astype(np.float32, copy=False)
+
+
+def _spherical_kmeans(x: np.ndarray, n_clusters: int, n_iter: int = 10, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    centroids = x[rng.choice(len(x), size=n_clusters, replace=False)].copy()
+    for _ in range(n_iter):
+        assign = _assign(x, centroids)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assign, x)
+        counts = np.bincount(assign, minlength=n_clusters)
+        empty = counts == 0
+        if empty.any():
+            # Re-seed empty buckets from random points so every list stays usable
+            sums[empty] = x[rng.choice(len(x), size=int(empty.sum()), replace=False)]
+        centroids = _normalize(sums)
+    return centroids
+
+
+def _assign(x: np.ndarray, centroids: np.ndarray, chunk: int = 65536) -> np.ndarray:
+    out = np.empty(len(x), dtype=np.int32)
+    for start in range(0, len(x), chunk):
+        out[start:start + chunk] = np.argmax(x[start:start + chunk] @ centroids.T, axis=1)
+    return out
+
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    k = min(k, len(scores))
+    if k == 0:
+        return np.empty(0, dtype=np.int64)
+    part = np.argpartition(-scores, k - 1)[:k]
+    return part[np.argsort(-scores[part])]
+
+
+class IVFIndex:
+    """Inverted-file index over L2-normalised float32 vectors (inner product = cosine)."""
+
+    def __init__(self, n_lists: int, n_probe: int, seed: int = 0):
+        self.n_lists = n_lists
+        self.n_probe = n_probe
+        self.seed = seed
+        self.centroids: Optional[np.ndarray] = None
+        self.vectors: Optional[np.ndarray] = None
+        self.ids: Optional[np.ndarray] = None
+        self.offsets: Optional[np.ndarray] = None
+        # Set when published: vectors / ids live in "<data_base>.vectors.npy" / ".ids.npy"
+        self.data_base: Optional[str] = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        if self.data_base:
+            state["vectors"] = state["ids"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        base = state.get("data_base")
+        if base:
+            self.vectors = np.load(f"{base}.vectors.npy", mmap_mode="r")
+            self.ids = np.load(f"{base}.ids.npy", mmap_mode="r")
+
+    def _id(self, i: int) -> str:
+        rid = self.ids[i]
+        return rid.decode("utf-8") if isinstance(rid, bytes) else rid
+
+    def build(self, embeddings: np.ndarray, ids: List[str]) -> None:
+        n_lists = max(1, min(self.n_lists, len(embeddings)))
+        self.centroids = _spherical_kmeans(embeddings, n_lists, seed=self.seed)
+        assign = _assign(embeddings, self.centroids)
+        # Store each inverted list contiguously so a probe is a single slice
+        order = np.argsort(assign, kind="stable")
+        self.vectors = np.ascontiguousarray(embeddings[order])
+        self.ids = np.asarray(ids, dtype=object)[order]
+        counts = np.bincount(assign, minlength=n_lists)
+        self.offsets = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+        self.n_lists = n_lists
+
+    def search(self, query: np.ndarray, k: int, n_probe: Optional[int] = None) -> List[Tuple[str, float]]:
+        n_probe = max(1, min(n_probe or self.n_probe, self.n_lists))
+        probe = _top_k(self.centroids @ query, n_probe)
+        rows = np.concatenate(
+            [np.arange(self.offsets[c], self.offsets[c + 1]) for c in probe]
+        )
+        scores = self.vectors[rows] @ query
+        best = _top_k(scores, k)
+        return [(self._id(rows[i]), float(scores[i])) for i in best]
+
+    def exact_search(self, query: np.ndarray, k: int) -> List[Tuple[str, float]]:
+        scores = self.vectors @ query
+        best = _top_k(scores, k)
+        return [(self._id(i), float(scores[i])) for i in best]
+
+
+class DenseMatcher:
+    def __init__(self, n_components: int, n_lists: int, n_probe: int):
+        self.n_components = n_components
+        self.n_lists = n_lists
+        self.n_probe = n_probe
+        self.vectorize: Optional[Callable] = None
+        self.svd = None
+        self.index: Optional[IVFIndex] = None
+        self.stats: dict = {}
+        # Vector-store vocabulary the model was fitted on (None when fitted on raw texts)
+        self.vocab_id: Optional[str] = None
+
+    def fit(self, ids: List[str], texts: List[str]) -> "DenseMatcher":
+        from sklearn.feature_extraction.text import TfidfVectorizer
+
+        from ai_engine import tokenize
+
+        vectorizer = TfidfVectorizer(analyzer=tokenize, sublinear_tf=True, dtype=np.float32)
+        tfidf = vectorizer.fit_transform(texts)
+        return self.fit_tfidf(ids, tfidf, vectorizer.transform)
+
+    def fit_tfidf(self, ids: List[str], tfidf, vectorize: Callable) -> "DenseMatcher":
+        """Fit on precomputed TF-IDF rows; `vectorize` must map new texts into the same space."""
+        from sklearn.decomposition import TruncatedSVD
+
+        started = time.perf_counter()
+        self.vectorize = vectorize
+        n_components = min(self.n_components, tfidf.shape[1] - 1, tfidf.shape[0])
+        if n_components < 1:
+            raise ValueError("Not enough resume text to build a dense index.")
+        self.svd = TruncatedSVD(n_components=n_components, random_state=0)
+        embeddings = _normalize(self.svd.fit_transform(tfidf))
+
+        n_lists = self.n_lists or int(np.sqrt(len(ids))) or 1
+        self.index = IVFIndex(n_lists=n_lists, n_probe=self.n_probe)
+        self.index.build(embeddings, ids)
+        self.stats = {
+            "n_resumes": len(ids),
+            "n_components": int(n_components),
+            "n_lists": self.index.n_lists,
+            "explained_variance": float(self.svd.explained_variance_ratio_.sum()),
+            "build_seconds": round(time.perf_counter() - started, 3),
+        }
+        return self
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        return _normalize(self.svd.transform(self.vectorize(texts)))
+
+    def top_k(self, job_description: str, k: int, n_probe: Optional[int] = None, exact: bool = False) -> List[Tuple[str, float]]:
+        query = self.embed([job_description])[0]
+        if exact:
+            return self.index.exact_search(query, k)
+        return self.index.search(query, k, n_probe)
+
+    def similarity(self, resume_text: str, job_description: str) -> float:
+        a, b = self.embed([resume_text, job_description])
+        return float(a @ b)
+
+
+_lock = threading.Lock()
+_matcher: Optional[DenseMatcher] = None
+_loaded_mtime: Optional[float] = None
+
+
+def _new_matcher() -> DenseMatcher:
+    return DenseMatcher(
+        n_components=settings.DENSE_N_COMPONENTS,
+        n_lists=settings.DENSE_N_LISTS,
+        n_probe=settings.DENSE_N_PROBE,
+    )
+
+
+def build_dense_index(ids: List[str], texts: List[str]) -> DenseMatcher:
+    """Fit a matcher on the given resumes and persist it so every worker can load it."""
+    return _publish(_new_matcher().fit(ids, texts))
+
+
+def build_dense_index_from_store() -> DenseMatcher:
+    """Fit on the vectors already in the on-disk store instead of re-vectorizing resumes."""
+    import vector_store
+
+    store = vector_store.get_vector_store()
+    matcher = _new_matcher().fit_tfidf(store.ids(), store.matrix(), vector_store.transform_texts)
+    matcher.vocab_id = store.vocab.vocab_id
+    return _publish(matcher)
+
+
+def _is_current(matcher: DenseMatcher) -> bool:
+    vocab_id = getattr(matcher, "vocab_id", None)
+    if vocab_id is None:
+        return True
+    import vector_store
+
+    vocab = vector_store.get_vector_store().vocab
+    return vocab is not None and vocab.vocab_id == vocab_id
+
+
+def _read_generations(path: str) -> List[str]:
+    try:
+        with open(f"{path}.generations") as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return []
+
+
+def _publish(matcher: DenseMatcher) -> DenseMatcher:
+    """Write the index for every worker; concurrent rebuilds are serialised by a lock file."""
+    global _matcher, _loaded_mtime
+    from vector_store import file_lock
+
+    path = settings.DENSE_INDEX_PATH
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    index = matcher.index
+    with file_lock(f"{path}.lock"):
+        # Fresh file names per build, so workers still mapping the previous arrays are unaffected
+        base = f"{path}.{uuid.uuid4().hex[:12]}"
+        np.save(f"{base}.vectors.npy", index.vectors)
+        np.save(f"{base}.ids.npy", np.asarray([str(i).encode("utf-8") for i in index.ids]))
+        index.data_base = base
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as fh:
+            pickle.dump(matcher, fh, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+        # Keep the previous generation too: a worker may be loading the old pickle right now
+        previous = _read_generations(path)[-1:]
+        keep = previous + [os.path.basename(base)]
+        tmp_path = f"{path}.generations.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as fh:
+            json.dump(keep, fh)
+        os.replace(tmp_path, f"{path}.generations")
+        for array in glob.glob(f"{glob.escape(path)}.*.npy"):
+            if os.path.basename(array).rsplit(".", 2)[0] not in keep:
+                try:
+                    os.remove(array)
+                except OSError:  # still mapped on Windows; removed by a later build
+                    pass
+
+        with _lock:
+            _matcher = matcher
+            _loaded_mtime = os.path.getmtime(path)
+    return matcher
+
+
+def get_dense_matcher() -> Optional[DenseMatcher]:
+    """Return the current matcher, reloading it when another worker rebuilt the index.
+
+    Returns None while no index exists or while it was fitted on a vector-store
+    vocabulary that has since been replaced (rebuild it to re-enable the dense path).
+    """
+    global _matcher, _loaded_mtime
+    path = settings.DENSE_INDEX_PATH
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        mtime = None
+    with _lock:
+        if mtime is not None and (_matcher is None or mtime != _loaded_mtime):
+            for attempt in range(2):
+                try:
+                    with open(path, "rb") as fh:
+                        _matcher = pickle.load(fh)
+                    _loaded_mtime = mtime
+                    break
+                except OSError as e:  # swapped mid-read; retry once, else keep the index already loaded
+                    if attempt:
+                        logger.warning(f"Could not load dense index: {type(e).__name__}: {e}")
+        matcher = _matcher
+    if matcher is not None and not _is_current(matcher):
+        if not getattr(matcher, "_stale_logged", False):
+            matcher._stale_logged = True
+            logger.warning("Dense index was built on an older vector-store vocabulary; rebuild it")
+        metrics.inc("dense_index_stale_total")
+        return None
+    return matcher
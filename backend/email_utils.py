@@ -8,12 +8,25 @@ from sqlalchemy.orm import Session
 
 from config import settings
 from models import EmailOTP, User
+from tracing import span
 
 
 def generate_otp() -> str:
     return f"{randint(100000, 999999)}"
 
 
+async def _send_message(message: EmailMessage) -> None:
+    with span("smtp.send", kind="client", **{"net.peer.name": settings.EMAIL_HOST, "net.peer.port": settings.EMAIL_PORT}):
+        await aiosmtplib.send(
+            message,
+            hostname=settings.EMAIL_HOST,
+            port=settings.EMAIL_PORT,
+            start_tls=settings.EMAIL_USE_TLS,
+            username=settings.EMAIL_USER,
+            password=settings.EMAIL_PASS,
+        )
+
+
 async def send_forgot_password_otp(recipient_email: str, user_name: str, otp_code: str) -> None:
     """Send OTP for forgot password flow."""
     message = EmailMessage()
@@ -29,14 +42,7 @@ async def send_forgot_password_otp(recipient_email: str, user_name: str, otp_cod
     )
     message.set_content(body)
 
-    await aiosmtplib.send(
-        message,
-        hostname=settings.EMAIL_HOST,
-        port=settings.EMAIL_PORT,
-        start_tls=True,
-        username=settings.EMAIL_USER,
-        password=settings.EMAIL_PASS,
-    )
+    await _send_message(message)
 
 
 async def send_otp_email(recipient_email: str, user_name: str, otp_code: str) -> None:
@@ -53,14 +59,7 @@ async def send_otp_email(recipient_email: str, user_name: str, otp_code: str) ->
     )
     message.set_content(body)
 
-    await aiosmtplib.send(
-        message,
-        hostname=settings.EMAIL_HOST,
-        port=settings.EMAIL_PORT,
-        start_tls=True,
-        username=settings.EMAIL_USER,
-        password=settings.EMAIL_PASS,
-    )
+    await _send_message(message)
 
 
 def create_and_store_otp(db: Session, user: User) -> EmailOTP:
@@ -0,0 +1,176 @@
+#!/usr/bin/env python
+"""
+Stub OpenAI-compatible server for load and resilience tests.
+
+Implements POST /v1/chat/completions and answers with interview-question
+JSON in the shape `ai_engine.generate_interview_questions` expects. Latency,
+jitter, latency spikes and error rate are configurable at start-up and can
+be changed at runtime with POST /_config (same field names, JSON body).
+Point the app at it with OPENAI_BASE_URL=http://127.0.0.1:<port>/v1.
+
+Standalone:
+    python fake_openai.py --port 8090 --latency-ms 300 --error-rate 0.05
+"""
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+_COUNT_RE = re.compile(r"Provide (\d+) questions per category")
+_LEVEL_RE = re.compile(r"candidate_experience_level: (\w+)")
+_CATEGORIES = ("Technical depth", "Problem-solving", "Communication skills")
+
+
+class FakeOpenAIConfig:
+    def __init__(
+        self,
+        latency_ms: float = 200,
+        jitter_ms: float = 50,
+        error_rate: float = 0.0,
+        slow_rate: float = 0.0,
+        slow_ms: float = 5000,
+        seed: Optional[int] = None,
+    ):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.slow_rate = slow_rate
+        self.slow_ms = slow_ms
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+
+    def update(self, values: dict) -> None:
+        with self.lock:
+            for key in ("latency_ms", "jitter_ms", "error_rate", "slow_rate", "slow_ms"):
+                if key in values:
+                    setattr(self, key, float(values[key]))
+
+    def draw(self):
+        """Return (delay_seconds, fail) for one request."""
+        with self.lock:
+            delay = self.latency_ms + self.rng.uniform(-self.jitter_ms, self.jitter_ms)
+            if self.rng.random() < self.slow_rate:
+                delay = self.slow_ms
+            fail = self.rng.random() < self.error_rate
+        return max(delay, 0) / 1000, fail
+
+
+def _completion(prompt: str, model: str) -> dict:
+    count_match = _COUNT_RE.search(prompt)
+    level_match = _LEVEL_RE.search(prompt)
+    count = int(count_match.group(1)) if count_match else 3
+    content = {
+        "candidate_experience_level": level_match.group(1) if level_match else "mid",
+        "categories": [
+            {
+                "category": category,
+                "questions": [
+                    {"question": f"{category} question {i + 1}?", "answer": f"Sample answer {i + 1}."}
+                    for i in range(count)
+                ],
+            }
+            for category in _CATEGORIES
+        ],
+    }
+    prompt_tokens = max(1, len(prompt) // 4)
+    completion_tokens = 40 * count * len(_CATEGORIES)
+    return {
+        "id": f"chatcmpl-fake-{int(time.time() * 1000)}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [
+            {
+                "index": 0,
+                "message": {"role": "assistant", "content": json.dumps(content)},
+                "finish_reason": "stop",
+            }
+        ],
+        "usage": {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        },
+    }
+
+
+def _handler_for(config: FakeOpenAIConfig):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format, *args):  # keep load tests quiet
+            pass
+
+        def _send(self, code: int, body: dict) -> None:
+            data = json.dumps(body).encode()
+            self.send_response(code)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            body = json.loads(self.rfile.read(length) or b"{}")
+            if self.path == "/_config":
+                config.update(body)
+                return self._send(200, {"ok": True})
+            if not self.path.endswith("/chat/completions"):
+                return self._send(404, {"error": {"message": "Not found"}})
+
+            delay, fail = config.draw()
+            time.sleep(delay)
+            if fail:
+                return self._send(500, {"error": {"message": "Injected failure", "type": "server_error"}})
+            prompt = "\n".join(m.get("content", "") for m in body.get("messages", []))
+            self._send(200, _completion(prompt, body.get("model", "fake-model")))
+
+    return Handler
+
+
+class FakeOpenAIServer:
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, config: Optional[FakeOpenAIConfig] = None):
+        self.config = config or FakeOpenAIConfig()
+        self._server = ThreadingHTTPServer((host, port), _handler_for(self.config))
+        self._server.daemon_threads = True
+        self.host, self.port = self._server.server_address[:2]
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}/v1"
+
+    def start(self) -> "FakeOpenAIServer":
+        threading.Thread(target=self._server.serve_forever, name="fake-openai", daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run a stub OpenAI-compatible server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--latency-ms", type=float, default=200)
+    parser.add_argument("--jitter-ms", type=float, default=50)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--slow-rate", type=float, default=0.0)
+    parser.add_argument("--slow-ms", type=float, default=5000)
+    args = parser.parse_args()
+
+    server = FakeOpenAIServer(
+        args.host,
+        args.port,
+        FakeOpenAIConfig(args.latency_ms, args.jitter_ms, args.error_rate, args.slow_rate, args.slow_ms),
+    )
+    print(f"Fake OpenAI server on {server.base_url}")
+    try:
+        server._server.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
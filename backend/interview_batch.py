@@ -0,0 +1,118 @@
+"""
+Concurrent fan-out of interview-question generation for many candidates.
+
+Each request gets its own thread pool sized to its concurrency (the LLM call
+is blocking I/O), so calls left running by an earlier batch cannot occupy a
+later batch's threads. Results are yielded in completion order until the
+overall deadline. Items still running at the deadline are reported as
+`timeout`; items that never reached upstream are reported as `not_started`.
+"""
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, List, Set
+
+from pydantic import ValidationError
+
+import ai_engine
+import schemas
+import tracing
+
+
+
+def _generate_on_thread(index: int, started: Set[int], *args) -> dict:
+    started.add(index)
+    return ai_engine.generate_interview_questions(*args)
+
+
+async def _generate_one(
+    index: int,
+    item: schemas.InterviewQuestionsRequest,
+    semaphore: asyncio.Semaphore,
+    executor: ThreadPoolExecutor,
+    started: Set[int],
+) -> schemas.InterviewQuestionsBatchItemResult:
+    loop = asyncio.get_running_loop()
+    async with semaphore:
+        started_at = time.perf_counter()
+        try:
+            # bind() carries the request's trace context onto the LLM thread
+            raw = await loop.run_in_executor(
+                executor,
+                tracing.bind(
+                    _generate_on_thread,
+                    index,
+                    started,
+                    item.resume_text,
+                    item.job_description,
+                    item.experience_level.value if item.experience_level else None,
+                    item.questions_per_category,
+                ),
+            )
+            result = schemas.InterviewQuestionsResponse(**raw)
+            status, error = "ok", None
+        except (ValueError, ValidationError) as e:
+            result, status, error = None, "error", str(e)
+        return schemas.InterviewQuestionsBatchItemResult(
+            index=index,
+            status=status,
+            result=result,
+            error=error,
+            elapsed_ms=round((time.perf_counter() - started_at) * 1000, 2),
+        )
+
+
+async def iter_batch(
+    items: List[schemas.InterviewQuestionsRequest],
+    max_concurrency: int,
+    deadline_seconds: float,
+) -> AsyncIterator[schemas.InterviewQuestionsBatchItemResult]:
+    """Yield per-item results as they finish, then `timeout` / `not_started` entries for the rest."""
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(max_concurrency)
+    executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="llm")
+    started: Set[int] = set()  # indices whose upstream call has begun
+    tasks = {
+        asyncio.create_task(_generate_one(index, item, semaphore, executor, started)): index
+        for index, item in enumerate(items)
+    }
+    deadline_at = loop.time() + deadline_seconds
+    pending = set(tasks)
+    try:
+        while pending:
+            remaining = deadline_at - loop.time()
+            if remaining <= 0:
+                break
+            done, pending = await asyncio.wait(
+                pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                yield task.result()
+        for task in sorted(pending, key=tasks.get):
+            task.cancel()
+            index = tasks[task]
+            if index in started:
+                yield schemas.InterviewQuestionsBatchItemResult(
+                    index=index, status="timeout", error="Deadline exceeded."
+                )
+            else:
+                yield schemas.InterviewQuestionsBatchItemResult(
+                    index=index, status="not_started", error="Deadline exceeded before the item was sent."
+                )
+    finally:
+        # Client went away or the generator was closed early
+        for task in pending:
+            task.cancel()
+        # Drop queued calls; in-flight ones finish on their own (bounded by OPENAI_TIMEOUT_SECONDS)
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def summarize(results: List[schemas.InterviewQuestionsBatchItemResult], elapsed_ms: float) -> dict:
+    return {
+        "total": len(results),
+        "ok": sum(r.status == "ok" for r in results),
+        "error": sum(r.status == "error" for r in results),
+        "timeout": sum(r.status == "timeout" for r in results),
+        "not_started": sum(r.status == "not_started" for r in results),
+        "elapsed_ms": round(elapsed_ms, 2),
+    }
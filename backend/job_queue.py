@@ -0,0 +1,393 @@
+#!/usr/bin/env python
+"""
+Durable, broker-free job queue for long scoring / question-generation batches.
+
+Jobs and their per-item results live in a local SQLite file (WAL mode), so
+they survive restarts and can be shared by every uvicorn worker on the host.
+A pool of worker processes claims queued jobs, calls the `ai_engine`
+functions item by item, and records progress after every item. A job whose
+worker stops heart-beating is re-queued and resumes after its last stored
+result.
+
+Workers start with the app when JOB_WORKERS > 0 (per uvicorn worker process),
+or standalone, which is the better fit for multi-worker deployments:
+    python job_queue.py --workers 4
+Dead worker processes are restarted by a supervisor thread.
+"""
+import json
+import logging
+import multiprocessing
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+_MAX_BACKOFF_SECONDS = 30.0
+_SUPERVISE_INTERVAL_SECONDS = 2.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    status TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    total INTEGER NOT NULL,
+    completed INTEGER NOT NULL DEFAULT 0,
+    failed INTEGER NOT NULL DEFAULT 0,
+    cancel_requested INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    created_at TEXT NOT NULL,
+    started_at TEXT,
+    finished_at TEXT,
+    heartbeat_at REAL
+);
+CREATE INDEX IF NOT EXISTS ix_jobs_status_created ON jobs (status, created_at);
+CREATE TABLE IF NOT EXISTS job_results (
+    job_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    result TEXT,
+    error TEXT,
+    PRIMARY KEY (job_id, seq)
+);
+"""
+
+
+def _connect() -> sqlite3.Connection:
+    path = settings.JOB_QUEUE_PATH
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    conn = sqlite3.connect(path, timeout=30, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+def init_queue() -> None:
+    conn = _connect()
+    try:
+        conn.executescript(_SCHEMA)
+    finally:
+        conn.close()
+
+
+def _now() -> str:
+    return datetime.utcnow().isoformat()
+
+
+# ---------------------------------------------------------------------------
+# API side
+# ---------------------------------------------------------------------------
+
+def submit_job(kind: str, items: List[dict]) -> str:
+    if kind not in _HANDLERS:
+        raise ValueError(f"Unknown job kind: {kind}")
+    job_id = str(uuid.uuid4())
+    conn = _connect()
+    try:
+        conn.execute(
+            "INSERT INTO jobs (id, kind, status, payload, total, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+            (job_id, kind, QUEUED, json.dumps(items), len(items), _now()),
+        )
+    finally:
+        conn.close()
+    return job_id
+
+
+def get_job(job_id: str) -> Optional[dict]:
+    conn = _connect()
+    try:
+        row = conn.execute(
+            "SELECT id, kind, status, total, completed, failed, error, created_at, started_at, finished_at "
+            "FROM jobs WHERE id = ?",
+            (job_id,),
+        ).fetchone()
+    finally:
+        conn.close()
+    return dict(row) if row else None
+
+
+def cancel_job(job_id: str) -> Optional[dict]:
+    """Cancel a queued job immediately; ask the worker to stop a running one."""
+    conn = _connect()
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        conn.execute(
+            "UPDATE jobs SET status = ?, finished_at = ? WHERE id = ? AND status = ?",
+            (CANCELLED, _now(), job_id, QUEUED),
+        )
+        conn.execute(
+            "UPDATE jobs SET cancel_requested = 1 WHERE id = ? AND status = ?",
+            (job_id, RUNNING),
+        )
+        conn.execute("COMMIT")
+    finally:
+        conn.close()
+    return get_job(job_id)
+
+
+def get_results(job_id: str, cursor: Optional[int], limit: int) -> Tuple[List[dict], Optional[int]]:
+    """Return results with seq > cursor, plus the cursor for the next page.
+
+    While the job can still produce results the cursor is always returned (the
+    last seen position when caught up), so pollers keep their place; it is
+    None only once a finished job has been read to the end.
+    """
+    conn = _connect()
+    try:
+        rows = conn.execute(
+            "SELECT seq, status, result, error FROM job_results "
+            "WHERE job_id = ? AND seq > ? ORDER BY seq LIMIT ?",
+            (job_id, -1 if cursor is None else cursor, limit + 1),
+        ).fetchall()
+        job = conn.execute("SELECT status FROM jobs WHERE id = ?", (job_id,)).fetchone()
+    finally:
+        conn.close()
+    items = [
+        {
+            "index": r["seq"],
+            "status": r["status"],
+            "result": json.loads(r["result"]) if r["result"] else None,
+            "error": r["error"],
+        }
+        for r in rows[:limit]
+    ]
+    last_seen = items[-1]["index"] if items else cursor
+    if len(rows) > limit:
+        next_cursor = last_seen
+    elif job is not None and job["status"] in (QUEUED, RUNNING):
+        next_cursor = -1 if last_seen is None else last_seen
+    else:
+        next_cursor = None
+    return items, next_cursor
+
+
+# ---------------------------------------------------------------------------
+# Worker side
+# ---------------------------------------------------------------------------
+
+def _score(item: dict) -> dict:
+    import ai_engine
+
+    score, recommendation, missing, matched = ai_engine.compute_match_score(
+        item["resume_text"], item["job_description"]
+    )
+    return {
+        "score": score,
+        "recommendation": recommendation,
+        "missing_keywords": missing,
+        "matched_keywords": matched,
+    }
+
+
+def _interview_questions(item: dict) -> dict:
+    import ai_engine
+
+    return ai_engine.generate_interview_questions(
+        item["resume_text"],
+        item["job_description"],
+        item.get("experience_level"),
+        item.get("questions_per_category", 3),
+    )
+
+
+_HANDLERS: Dict[str, Callable[[dict], dict]] = {
+    "match": _score,
+    "interview_questions": _interview_questions,
+}
+
+
+def _claim_next(conn: sqlite3.Connection) -> Optional[sqlite3.Row]:
+    stale_before = time.time() - settings.JOB_LEASE_SECONDS
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        # Re-queue jobs whose worker died mid-run; they resume after their last result
+        conn.execute(
+            "UPDATE jobs SET status = ? WHERE status = ? AND heartbeat_at < ?",
+            (QUEUED, RUNNING, stale_before),
+        )
+        row = conn.execute(
+            "SELECT id, kind, payload, completed, failed, cancel_requested FROM jobs "
+            "WHERE status = ? ORDER BY created_at LIMIT 1",
+            (QUEUED,),
+        ).fetchone()
+        if row is not None:
+            conn.execute(
+                "UPDATE jobs SET status = ?, started_at = COALESCE(started_at, ?), heartbeat_at = ? WHERE id = ?",
+                (RUNNING, _now(), time.time(), row["id"]),
+            )
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    return row
+
+
+def _run_job(conn: sqlite3.Connection, job: sqlite3.Row) -> None:
+    handler = _HANDLERS[job["kind"]]
+    items = json.loads(job["payload"])
+    done = {
+        r["seq"]
+        for r in conn.execute("SELECT seq FROM job_results WHERE job_id = ?", (job["id"],))
+    }
+
+    for seq, item in enumerate(items):
+        if seq in done:
+            continue
+        # Renew the lease before each (possibly long) item
+        renewed = conn.execute(
+            "UPDATE jobs SET heartbeat_at = ? WHERE id = ? AND status = ?",
+            (time.time(), job["id"], RUNNING),
+        ).rowcount
+        if not renewed:
+            # Lease expired and the job was re-queued, or it already finished elsewhere
+            logger.warning(f"Job {job['id']} is no longer running on this worker; stopping")
+            return
+        cancel = conn.execute(
+            "SELECT cancel_requested FROM jobs WHERE id = ?", (job["id"],)
+        ).fetchone()["cancel_requested"]
+        if cancel:
+            conn.execute(
+                "UPDATE jobs SET status = ?, finished_at = ? WHERE id = ? AND status = ?",
+                (CANCELLED, _now(), job["id"], RUNNING),
+            )
+            return
+
+        try:
+            result, error, item_status = json.dumps(handler(item)), None, SUCCEEDED
+        except Exception as e:
+            logger.warning(f"Job {job['id']} item {seq} failed: {type(e).__name__}: {e}")
+            result, error, item_status = None, f"{type(e).__name__}: {e}", FAILED
+
+        # Idempotent per (job, item): if a re-queued copy of this job already stored the
+        # item, keep the first result; counts are derived from the stored rows
+        conn.execute("BEGIN IMMEDIATE")
+        conn.execute(
+            "INSERT OR IGNORE INTO job_results (job_id, seq, status, result, error) VALUES (?, ?, ?, ?, ?)",
+            (job["id"], seq, item_status, result, error),
+        )
+        conn.execute(
+            "UPDATE jobs SET "
+            "completed = (SELECT COUNT(*) FROM job_results WHERE job_id = ? AND status = ?), "
+            "failed = (SELECT COUNT(*) FROM job_results WHERE job_id = ? AND status = ?), "
+            "heartbeat_at = ? WHERE id = ?",
+            (job["id"], SUCCEEDED, job["id"], FAILED, time.time(), job["id"]),
+        )
+        conn.execute("COMMIT")
+
+    # A cancel that arrived during the last item still wins; a job that is no longer
+    # RUNNING (re-queued after a lost lease, or cancelled) is left alone
+    conn.execute(
+        "UPDATE jobs SET status = CASE WHEN cancel_requested THEN ? ELSE ? END, finished_at = ? "
+        "WHERE id = ? AND status = ?",
+        (CANCELLED, SUCCEEDED, _now(), job["id"], RUNNING),
+    )
+
+
+def _worker_loop() -> None:
+    conn = _connect()
+    logger.info(f"Job worker {os.getpid()} started")
+    backoff = settings.JOB_POLL_INTERVAL_SECONDS
+    while True:
+        try:
+            job = _claim_next(conn)
+        except sqlite3.Error as e:
+            # e.g. "database is locked" under contention: back off and retry on a fresh connection
+            logger.warning(f"Job worker {os.getpid()} could not claim a job: {e}; retrying in {backoff:.1f}s")
+            time.sleep(backoff)
+            backoff = min(backoff * 2, _MAX_BACKOFF_SECONDS)
+            conn.close()
+            conn = _connect()
+            continue
+        backoff = settings.JOB_POLL_INTERVAL_SECONDS
+        if job is None:
+            time.sleep(settings.JOB_POLL_INTERVAL_SECONDS)
+            continue
+        try:
+            _run_job(conn, job)
+        except Exception as e:
+            logger.error(f"Job {job['id']} crashed: {type(e).__name__}: {e}", exc_info=True)
+            try:
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+                conn.execute(
+                    "UPDATE jobs SET status = CASE WHEN cancel_requested THEN ? ELSE ? END, "
+                    "error = ?, finished_at = ? WHERE id = ? AND status = ?",
+                    (CANCELLED, FAILED, f"{type(e).__name__}: {e}", _now(), job["id"], RUNNING),
+                )
+            except sqlite3.Error as e2:
+                # Leave it running; the lease expires and another worker resumes it
+                logger.error(f"Could not mark job {job['id']} failed: {e2}")
+                conn.close()
+                conn = _connect()
+
+
+_workers: List[multiprocessing.Process] = []
+_supervisor: Optional[threading.Thread] = None
+_stop = threading.Event()
+
+
+def _spawn() -> multiprocessing.Process:
+    proc = multiprocessing.get_context("spawn").Process(target=_worker_loop, daemon=True)
+    proc.start()
+    return proc
+
+
+def _supervise() -> None:
+    while not _stop.wait(_SUPERVISE_INTERVAL_SECONDS):
+        for i, proc in enumerate(_workers):
+            if not proc.is_alive() and not _stop.is_set():
+                logger.error(f"Job worker {proc.pid} exited with code {proc.exitcode}; restarting")
+                _workers[i] = _spawn()
+
+
+def start_workers(count: int) -> None:
+    global _supervisor
+    init_queue()
+    _stop.clear()
+    for _ in range(count):
+        _workers.append(_spawn())
+    _supervisor = threading.Thread(target=_supervise, name="job-supervisor", daemon=True)
+    _supervisor.start()
+
+
+def stop_workers() -> None:
+    global _supervisor
+    _stop.set()
+    if _supervisor is not None:
+        _supervisor.join(timeout=5)
+        _supervisor = None
+    for proc in _workers:
+        proc.terminate()
+    for proc in _workers:
+        proc.join(timeout=5)
+    _workers.clear()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run job queue workers.")
+    parser.add_argument("--workers", type=int, default=max(1, settings.JOB_WORKERS))
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    start_workers(args.workers)
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        stop_workers()
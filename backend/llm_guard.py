@@ -0,0 +1,275 @@
+"""
+Resilience around the OpenAI chat-completion call.
+
+- Deadline: every call runs with OPENAI_TIMEOUT_SECONDS and no SDK retries
+  (the SDK default is a 600 s timeout and two retries), so a slow upstream
+  cannot pin threadpool threads.
+- Circuit breaker: OPENAI_BREAKER_FAILURE_THRESHOLD consecutive upstream
+  failures (timeouts, connection errors, 429s, 5xx) or slow calls (> OPENAI_BREAKER_SLOW_CALL_SECONDS) open it; while open,
+  callers fail fast. After OPENAI_BREAKER_RESET_SECONDS one probe call is let
+  through (half-open) and its outcome closes or re-opens the breaker. Other
+  4xx errors are the request's or the configuration's fault and do not count.
+- Hedging (optional): when OPENAI_HEDGE_AFTER_MS > 0 and the first attempt
+  has not answered by then, a second identical request is sent and the first
+  success wins. At most OPENAI_HEDGE_MAX_INFLIGHT hedges run at once.
+- Fallback: while the breaker is open, `fallback_questions` serves the last
+  good answer for the same input from an LRU cache, or template questions
+  built from the job description's keywords.
+
+Try it against the stub server with `python bench_llm_guard.py`.
+"""
+import hashlib
+import threading
+import time
+from collections import Counter, OrderedDict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import List, Optional
+
+import metrics
+import tracing
+from config import settings
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Shared by primary and hedge attempts when hedging is on
+_HEDGE_POOL_SIZE = 64
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling upstream while the breaker is open."""
+
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold: int, reset_seconds: float):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN and time.monotonic() - self.opened_at >= self.reset_seconds:
+                self.state = HALF_OPEN
+                self._probing = False
+            if self.state == HALF_OPEN and not self._probing:
+                self._probing = True  # exactly one probe at a time
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self._probing = False
+            self.state = CLOSED
+
+    def release(self) -> None:
+        """Call finished without telling us anything about upstream health (e.g. a 400)."""
+        with self._lock:
+            self._probing = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            self._probing = False
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != OPEN:
+                    metrics.inc("openai_breaker_opened_total")
+                self.state = OPEN
+                self.opened_at = time.monotonic()
+
+
+breaker = CircuitBreaker(settings.OPENAI_BREAKER_FAILURE_THRESHOLD, settings.OPENAI_BREAKER_RESET_SECONDS)
+
+_hedge_executor: Optional[ThreadPoolExecutor] = None
+_hedge_slots = threading.BoundedSemaphore(max(1, settings.OPENAI_HEDGE_MAX_INFLIGHT))
+_executor_lock = threading.Lock()
+
+
+def _executor() -> ThreadPoolExecutor:
+    global _hedge_executor
+    with _executor_lock:
+        if _hedge_executor is None:
+            _hedge_executor = ThreadPoolExecutor(max_workers=_HEDGE_POOL_SIZE, thread_name_prefix="openai")
+        return _hedge_executor
+
+
+def _hedged(create, kwargs: dict, timeout: float):
+    started = time.monotonic()
+    attempts = [_executor().submit(tracing.bind(create, **kwargs))]
+    done, _ = wait(attempts, timeout=settings.OPENAI_HEDGE_AFTER_MS / 1000)
+    if not done and _hedge_slots.acquire(blocking=False):
+        metrics.inc("openai_hedges_total")
+        hedge = _executor().submit(tracing.bind(create, **kwargs))
+        hedge.add_done_callback(lambda _: _hedge_slots.release())
+        attempts.append(hedge)
+
+    pending, error = set(attempts), None
+    while pending:
+        remaining = timeout - (time.monotonic() - started)
+        done, pending = wait(pending, timeout=max(remaining, 0), return_when=FIRST_COMPLETED)
+        if not done:
+            raise TimeoutError(f"OpenAI call exceeded {timeout:.0f}s deadline")
+        for attempt in done:
+            if attempt.exception() is None:
+                if attempt is not attempts[0]:
+                    metrics.inc("openai_hedge_wins_total")
+                return attempt.result()
+            error = attempt.exception()
+    raise error
+
+
+def _is_upstream_failure(error: Exception) -> bool:
+    import openai
+
+    if isinstance(error, (TimeoutError, openai.APIConnectionError, openai.RateLimitError)):
+        return True  # APITimeoutError is an APIConnectionError
+    return isinstance(error, openai.APIStatusError) and error.status_code >= 500
+
+
+def chat_completion(client, **kwargs):
+    """`client.chat.completions.create(**kwargs)` with deadline, breaker and optional hedging."""
+    if not breaker.allow():
+        metrics.inc("openai_calls_total", outcome="rejected")
+        raise CircuitOpenError("OpenAI circuit breaker is open.")
+    timeout = settings.OPENAI_TIMEOUT_SECONDS
+    create = client.with_options(timeout=timeout, max_retries=0).chat.completions.create
+    started = time.monotonic()
+    try:
+        if settings.OPENAI_HEDGE_AFTER_MS > 0:
+            resp = _hedged(create, kwargs, timeout)
+        else:
+            resp = create(**kwargs)
+    except Exception as e:
+        if _is_upstream_failure(e):
+            breaker.record_failure()
+            metrics.inc("openai_calls_total", outcome="error")
+        else:
+            breaker.release()
+            metrics.inc("openai_calls_total", outcome="client_error")
+        raise
+    elapsed = time.monotonic() - started
+    metrics.observe("openai_call", elapsed)
+    if elapsed > settings.OPENAI_BREAKER_SLOW_CALL_SECONDS:
+        breaker.record_failure()
+        metrics.inc("openai_calls_total", outcome="slow")
+    else:
+        breaker.record_success()
+        metrics.inc("openai_calls_total", outcome="ok")
+    return resp
+
+
+# ---------------------------------------------------------------------------
+# Fallbacks
+# ---------------------------------------------------------------------------
+
+_cache: "OrderedDict[str, dict]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def cache_key(model: str, resume_text: str, job_description: str, exp: str, questions_per_category: int) -> str:
+    digest = hashlib.sha256()
+    for part in (model, exp, str(questions_per_category), resume_text, job_description):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def remember(key: str, result: dict) -> None:
+    if settings.OPENAI_FALLBACK_CACHE_SIZE <= 0:
+        return
+    with _cache_lock:
+        _cache[key] = result
+        _cache.move_to_end(key)
+        while len(_cache) > settings.OPENAI_FALLBACK_CACHE_SIZE:
+            _cache.popitem(last=False)
+
+
+_TECHNICAL = [
+    (
+        "Describe a recent project where you used {skill}. What was your part and which trade-offs did you make?",
+        "Look for concrete scope, the candidate's own contribution and reasons behind the technical choices.",
+    ),
+    (
+        "What are common pitfalls when working with {skill}, and how do you avoid them?",
+        "A strong answer names specific failure modes and the practices or tooling used to prevent them.",
+    ),
+    (
+        "How would you explain how {skill} works to a new team member?",
+        "Expect a clear, correct mental model pitched at the listener's level.",
+    ),
+]
+_PROBLEM_SOLVING = [
+    (
+        "This role relies on {skill}. How would you become productive with it in your first month?",
+        "Look for a realistic learning plan: documentation, small deliverables and asking for reviews early.",
+    ),
+    (
+        "Tell me about a difficult production issue you debugged. How did you narrow it down?",
+        "Expect a structured approach: reproduce, isolate, form hypotheses, verify the fix and prevent recurrence.",
+    ),
+    (
+        "How do you approach a task whose requirements are unclear?",
+        "Good answers clarify goals with stakeholders, state assumptions and iterate on a small first version.",
+    ),
+]
+_COMMUNICATION = [
+    (
+        "How do you explain a technical decision to non-technical stakeholders?",
+        "Look for focus on impact and trade-offs in plain language, checking for understanding.",
+    ),
+    (
+        "Describe a disagreement with a teammate and how it was resolved.",
+        "Expect respect for other views, use of evidence and a constructive outcome.",
+    ),
+    (
+        "How do you keep your team informed about progress and risks?",
+        "Good answers mention regular updates, raising risks early and written summaries.",
+    ),
+]
+
+
+def _template_questions(resume_text: str, job_description: str, exp: str, questions_per_category: int) -> dict:
+    from ai_engine import _keyword_counts, _keywords, tokenize
+
+    job_counts = _keyword_counts(Counter(tokenize(job_description)))
+    resume_words = _keywords(Counter(tokenize(resume_text)))
+    ranked = sorted(job_counts, key=lambda w: (-job_counts[w], w))
+    matched: List[str] = [w for w in ranked if w in resume_words] or ranked or ["the main technologies of this role"]
+    missing: List[str] = [w for w in ranked if w not in resume_words] or matched
+
+    def questions(templates, skills):
+        return [
+            {
+                "question": templates[i % len(templates)][0].format(skill=skills[i % len(skills)]),
+                "answer": templates[i % len(templates)][1],
+            }
+            for i in range(questions_per_category)
+        ]
+
+    return {
+        "candidate_experience_level": exp,
+        "categories": [
+            {"category": "Technical depth", "questions": questions(_TECHNICAL, matched)},
+            {"category": "Problem-solving", "questions": questions(_PROBLEM_SOLVING, missing)},
+            {"category": "Communication skills", "questions": questions(_COMMUNICATION, matched)},
+        ],
+        "model_used": "template",
+    }
+
+
+def fallback_questions(key: str, resume_text: str, job_description: str, exp: str, questions_per_category: int) -> dict:
+    """Cached answer for the same input if there is one, else template questions."""
+    with _cache_lock:
+        cached = _cache.get(key)
+    if cached is not None:
+        metrics.inc("openai_fallback_total", source="cache")
+        return {**cached, "fallback": "cache"}
+    metrics.inc("openai_fallback_total", source="template")
+    return {**_template_questions(resume_text, job_description, exp, questions_per_category), "fallback": "template"}
@@ -0,0 +1,240 @@
+#!/usr/bin/env python
+"""
+End-to-end load test of the real user flow, fully offline.
+
+Starts the app (uvicorn subprocess) against a throwaway SQLite database, a
+local SMTP sink that captures OTPs and a stub OpenAI-compatible server, then
+drives signup -> verify-otp -> login -> match-job-file -> interview-questions
+with the requested concurrency. Prints per-endpoint latency percentiles,
+error rates and requests per second as JSON.
+
+Usage (from the backend folder):
+    python loadtest.py --flows 200 --concurrency 20 --openai-latency-ms 400
+"""
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, List
+
+import httpx
+
+from fake_openai import FakeOpenAIConfig, FakeOpenAIServer
+from smtp_sink import SMTPSink
+
+_RESUME = (
+    "Senior Python engineer with 6 years building FastAPI and Django services, "
+    "PostgreSQL, Redis, Docker and Kubernetes on AWS. Led a team of four."
+)
+_JOB = (
+    "We are hiring a backend engineer experienced in Python, FastAPI, SQL databases, "
+    "Docker, Kubernetes and cloud infrastructure. Mentoring experience is a plus."
+)
+
+
+def _pdf_bytes(text: str) -> bytes:
+    """Smallest valid single-page PDF with one line of Helvetica text."""
+    content = f"BT /F1 11 Tf 50 750 Td ({text}) Tj ET".encode("latin-1")
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents 4 0 R "
+        b"/Resources << /Font << /F1 5 0 R >> >> >>",
+        b"<< /Length %d >>\nstream\n" % len(content) + content + b"\nendstream",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    out = b"%PDF-1.4\n"
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return out
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class Recorder:
+    def __init__(self):
+        self.samples: Dict[str, List[float]] = {}
+        self.errors: Dict[str, int] = {}
+
+    def add(self, endpoint: str, seconds: float, ok: bool) -> None:
+        self.samples.setdefault(endpoint, []).append(seconds)
+        if not ok:
+            self.errors[endpoint] = self.errors.get(endpoint, 0) + 1
+
+    def report(self, wall_seconds: float) -> dict:
+        def pct(values: List[float], q: float) -> float:
+            ordered = sorted(values)
+            return round(ordered[min(len(ordered) - 1, int(q / 100 * len(ordered)))] * 1000, 2)
+
+        endpoints = {}
+        for endpoint, values in self.samples.items():
+            errors = self.errors.get(endpoint, 0)
+            endpoints[endpoint] = {
+                "requests": len(values),
+                "errors": errors,
+                "error_rate": round(errors / len(values), 4),
+                "p50_ms": pct(values, 50),
+                "p90_ms": pct(values, 90),
+                "p99_ms": pct(values, 99),
+                "max_ms": round(max(values) * 1000, 2),
+                "rps": round(len(values) / wall_seconds, 2),
+            }
+        total = sum(len(v) for v in self.samples.values())
+        return {
+            "wall_seconds": round(wall_seconds, 2),
+            "total_requests": total,
+            "total_rps": round(total / wall_seconds, 2),
+            "endpoints": endpoints,
+        }
+
+
+async def _timed(recorder: Recorder, endpoint: str, request) -> httpx.Response:
+    started = time.perf_counter()
+    try:
+        response = await request
+    except httpx.HTTPError:
+        recorder.add(endpoint, time.perf_counter() - started, False)
+        raise
+    recorder.add(endpoint, time.perf_counter() - started, response.is_success)
+    response.raise_for_status()
+    return response
+
+
+async def _user_flow(client: httpx.AsyncClient, sink: SMTPSink, recorder: Recorder, pdf: bytes) -> None:
+    email = f"load-{uuid.uuid4().hex[:12]}@example.com"
+    password = "loadtest-password"
+    signup = await _timed(recorder, "POST /auth/signup", client.post(
+        "/auth/signup", json={"name": "Load Test", "email": email, "password": password}
+    ))
+    otp = await sink.wait_for_otp(email)
+    await _timed(recorder, "POST /auth/verify-otp", client.post(
+        "/auth/verify-otp", json={"signup_token": signup.json()["signup_token"], "email": email, "otp": otp}
+    ))
+    await _timed(recorder, "POST /auth/login", client.post(
+        "/auth/login", json={"email": email, "password": password}
+    ))
+    match = await _timed(recorder, "POST /ai/match-job-file", client.post(
+        "/ai/match-job-file",
+        files={"file": ("resume.pdf", pdf, "application/pdf")},
+        data={"job_description": _JOB},
+    ))
+    await _timed(recorder, "POST /ai/interview-questions", client.post(
+        "/ai/interview-questions",
+        json={"resume_text": match.json()["resume_text"] or _RESUME, "job_description": _JOB},
+    ))
+
+
+async def _drive(base_url: str, sink: SMTPSink, flows: int, concurrency: int, timeout: float) -> dict:
+    recorder = Recorder()
+    pdf = _pdf_bytes(_RESUME[:200])
+    semaphore = asyncio.Semaphore(concurrency)
+    failed_flows = 0
+
+    async def one(client: httpx.AsyncClient) -> None:
+        nonlocal failed_flows
+        async with semaphore:
+            try:
+                await _user_flow(client, sink, recorder, pdf)
+            except Exception:
+                failed_flows += 1
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, timeout=timeout, limits=limits) as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(one(client) for _ in range(flows)))
+        wall = time.perf_counter() - started
+
+    report = recorder.report(wall)
+    report["flows"] = {"total": flows, "failed": failed_flows, "concurrency": concurrency}
+    return report
+
+
+def _wait_until_up(base_url: str, proc: subprocess.Popen, timeout: float = 30) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError("App exited during start-up; see its output above.")
+        try:
+            if httpx.get(f"{base_url}/metrics", timeout=1).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError("App did not start in time.")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--flows", type=int, default=50, help="number of complete user flows")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--app-workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--openai-latency-ms", type=float, default=300)
+    parser.add_argument("--openai-jitter-ms", type=float, default=50)
+    parser.add_argument("--openai-error-rate", type=float, default=0.0)
+    parser.add_argument("--timeout", type=float, default=60, help="per-request client timeout (s)")
+    parser.add_argument("--output", help="also write the JSON report to this file")
+    args = parser.parse_args()
+
+    sink = SMTPSink().start()
+    fake = FakeOpenAIServer(config=FakeOpenAIConfig(
+        args.openai_latency_ms, args.openai_jitter_ms, args.openai_error_rate
+    )).start()
+
+    workdir = tempfile.mkdtemp(prefix="smarthire-loadtest-")
+    port = _free_port()
+    env = {
+        **os.environ,
+        "DATABASE_URL": f"sqlite:///{os.path.join(workdir, 'loadtest.db')}",
+        "EMAIL_HOST": sink.host,
+        "EMAIL_PORT": str(sink.port),
+        "EMAIL_USE_TLS": "false",
+        "EMAIL_USER": "loadtest@smarthire.local",
+        "EMAIL_PASS": "loadtest",
+        "OPENAI_API_KEY": "loadtest",
+        "OPENAI_BASE_URL": fake.base_url,
+        "JOB_QUEUE_PATH": os.path.join(workdir, "jobs.sqlite3"),
+        "JOB_WORKERS": "0",
+    }
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--workers", str(args.app_workers), "--log-level", "warning"],
+        cwd=str(Path(__file__).parent),
+        env=env,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        _wait_until_up(base_url, proc)
+        report = asyncio.run(_drive(base_url, sink, args.flows, args.concurrency, args.timeout))
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+        fake.stop()
+        sink.stop()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        Path(args.output).write_text(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Event-loop blocking detector.
+
+A heartbeat coroutine wakes every LOOP_WATCHDOG_INTERVAL_MS and records how
+late it woke up (event-loop lag). A daemon thread checks the last heartbeat;
+when the loop has not come back for LOOP_WATCHDOG_THRESHOLD_MS it samples
+the loop thread's stack *while it is still blocked*, finds the request being
+served and logs both, and increments `event_loop_blocked_total{route=...}`.
+
+Requests are tracked by a pure ASGI middleware that maps its own frame to the
+request scope, so finding the route is a walk up the blocked frame chain.
+Steady-state cost is one short sleep per interval on the loop, one thread
+wake-up per interval and a dict set / pop per request.
+"""
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from typing import Dict, Optional
+
+import metrics
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+_STACK_LIMIT = 25
+
+# id(middleware frame) -> ASGI scope of the request it is serving
+_active_requests: Dict[int, dict] = {}
+
+_last_beat = 0.0
+_loop_thread_id: Optional[int] = None
+_heartbeat_task: Optional[asyncio.Task] = None
+_thread: Optional[threading.Thread] = None
+_stop = threading.Event()
+
+
+class RouteTrackingMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        key = id(sys._getframe())
+        _active_requests[key] = scope
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _active_requests.pop(key, None)
+
+
+def _route_of(frame) -> str:
+    while frame is not None:
+        scope = _active_requests.get(id(frame))
+        if scope is not None:
+            route = scope.get("route")
+            # Route template once the router has matched, else the raw path
+            return getattr(route, "path", None) or scope.get("path", "unknown")
+        frame = frame.f_back
+    return "none"
+
+
+async def _heartbeat(interval: float) -> None:
+    global _last_beat
+    while True:
+        expected = time.monotonic() + interval
+        await asyncio.sleep(interval)
+        _last_beat = time.monotonic()
+        metrics.observe("event_loop_lag", max(0.0, _last_beat - expected))
+
+
+def _watch(interval: float, threshold: float) -> None:
+    reported_beat = None
+    while not _stop.wait(interval):
+        beat = _last_beat
+        stalled_for = time.monotonic() - beat - interval
+        if stalled_for < threshold or beat == reported_beat:
+            continue
+        reported_beat = beat  # one report per stall
+        frame = sys._current_frames().get(_loop_thread_id)
+        if frame is None:
+            continue
+        route = _route_of(frame)
+        stack = "".join(traceback.format_stack(frame, limit=_STACK_LIMIT))
+        metrics.inc("event_loop_blocked_total", route=route)
+        logger.warning(
+            f"Event loop blocked for {stalled_for * 1000:.0f}ms+ while serving {route}; stack sample:\n{stack}"
+        )
+
+
+def start() -> None:
+    """Start the heartbeat on the running loop and the watchdog thread (call from an async startup hook)."""
+    global _heartbeat_task, _thread, _loop_thread_id, _last_beat
+    if not settings.LOOP_WATCHDOG_ENABLED or _thread is not None:
+        return
+    interval = settings.LOOP_WATCHDOG_INTERVAL_MS / 1000
+    threshold = settings.LOOP_WATCHDOG_THRESHOLD_MS / 1000
+    _loop_thread_id = threading.get_ident()
+    _last_beat = time.monotonic()
+    _heartbeat_task = asyncio.get_running_loop().create_task(_heartbeat(interval))
+    _stop.clear()
+    _thread = threading.Thread(target=_watch, args=(interval, threshold), name="loop-watchdog", daemon=True)
+    _thread.start()
+
+
+def stop() -> None:
+    global _heartbeat_task, _thread
+    if _heartbeat_task is not None:
+        _heartbeat_task.cancel()
+        _heartbeat_task = None
+    if _thread is not None:
+        _stop.set()
+        _thread.join(timeout=5)
+        _thread = None
@@ -4,16 +4,31 @@ from pathlib import Path
 # Add parent directory to path to enable backend module imports when running from backend directory
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+import json
+import logging
+import time
 import uuid
 from datetime import datetime, timedelta
+from typing import Optional
 
-from fastapi import Depends, FastAPI, File, Form, HTTPException, UploadFile, status
+from fastapi import Depends, FastAPI, File, Form, HTTPException, Query, UploadFile, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
 import ai_engine
+import cpu_executor
+import dense_index
+import interview_batch
+import job_queue
+import loop_watchdog
+import match_history
+import metrics
 import models
+import pdf_extract
 import schemas
+import tracing
+import vector_store
 from config import settings
 from database import Base, engine, get_db
 from email_utils import generate_otp, send_otp_email, send_forgot_password_otp
@@ -23,10 +38,72 @@ from security import (
     verify_password,
 )
 
+logger = logging.getLogger(__name__)
+
 Base.metadata.create_all(bind=engine)
 
 app = FastAPI(title="SmartHire AI")
 
+
+@app.on_event("startup")
+def _start_job_workers():
+    job_queue.init_queue()
+    if settings.JOB_WORKERS > 0:
+        job_queue.start_workers(settings.JOB_WORKERS)
+
+
+@app.on_event("shutdown")
+def _stop_job_workers():
+    job_queue.stop_workers()
+
+
+@app.on_event("startup")
+def _start_scoring_executor():
+    cpu_executor.start()
+
+
+@app.on_event("shutdown")
+def _stop_scoring_executor():
+    cpu_executor.shutdown()
+
+
+@app.on_event("startup")
+def _start_match_history_writer():
+    match_history.start()
+
+
+@app.on_event("shutdown")
+def _stop_match_history_writer():
+    match_history.stop()
+
+
+@app.on_event("startup")
+def _start_trace_exporter():
+    tracing.start()
+
+
+@app.on_event("shutdown")
+def _stop_trace_exporter():
+    tracing.stop()
+
+
+@app.on_event("startup")
+async def _start_loop_watchdog():
+    loop_watchdog.start()
+
+
+@app.on_event("shutdown")
+async def _stop_loop_watchdog():
+    loop_watchdog.stop()
+
+
+if settings.LOOP_WATCHDOG_ENABLED:
+    app.add_middleware(loop_watchdog.RouteTrackingMiddleware)
+
+if settings.TRACE_ENABLED:
+    tracing.instrument_engine(engine)
+    app.add_middleware(tracing.TracingMiddleware)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["http://localhost:5173", "http://127.0.0.1:5173"],  # For development, restrict this in production
@@ -56,6 +133,11 @@ def _cleanup_expired_resets():
         del _pending_password_resets[k]
 
 
+@app.get("/metrics")
+def get_metrics():
+    return metrics.snapshot()
+
+
 @app.post("/auth/signup", status_code=status.HTTP_201_CREATED)
 async def signup(user_in: schemas.UserCreate, db: Session = Depends(get_db)):
     # Ensure email is not already registered
@@ -327,58 +409,166 @@ def analyze_resume(payload: schemas.ResumeAnalysisRequest):
     return {"cleaned_text": cleaned}
 
 
+def _record_match(resume_text: str, job_description: str, job_id: Optional[str], candidate_id: Optional[str], result: dict) -> dict:
+    ids = {
+        "job_id": job_id or match_history.text_key("jd", job_description),
+        "candidate_id": candidate_id or match_history.text_key("cv", resume_text),
+    }
+    match_history.record(ids["job_id"], ids["candidate_id"], result)
+    return ids
+
+
 @app.post("/ai/match-job", response_model=schemas.MatchScoreResponse)
-def match_job(payload: schemas.JobMatchRequest):
-    score, recommendation, missing, matched = ai_engine.compute_match_score(
-        payload.resume_text, payload.job_description
+async def match_job(payload: schemas.JobMatchRequest):
+    # CPU-bound: runs on the scoring executor (threadpool or warm process pool)
+    result = await cpu_executor.score(payload.resume_text, payload.job_description)
+    ids = _record_match(
+        payload.resume_text, payload.job_description, payload.job_id, payload.candidate_id, result
     )
-    return schemas.MatchScoreResponse(
-        score=score,
-        recommendation=recommendation,
-        missing_keywords=missing,
-        matched_keywords=matched,
-        resume_text=payload.resume_text,
+    return schemas.MatchScoreResponse(**result, **ids, resume_text=payload.resume_text)
+
+
+@app.get("/ai/match-history/jobs/{job_id}", response_model=schemas.MatchHistoryPage)
+def match_history_for_job(
+    job_id: str,
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=500),
+    db: Session = Depends(get_db),
+):
+    try:
+        items, next_cursor = match_history.results_for_job(db, job_id, limit, cursor)
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor.")
+    return schemas.MatchHistoryPage(items=items, next_cursor=next_cursor)
+
+
+@app.get("/ai/match-history/candidates/{candidate_id}", response_model=schemas.MatchHistoryPage)
+def match_history_for_candidate(
+    candidate_id: str,
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=500),
+    db: Session = Depends(get_db),
+):
+    try:
+        items, next_cursor = match_history.results_for_candidate(db, candidate_id, limit, cursor)
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor.")
+    return schemas.MatchHistoryPage(items=items, next_cursor=next_cursor)
+
+
+@app.post("/ai/resumes", response_model=schemas.ResumeOut, status_code=status.HTTP_201_CREATED)
+def create_resume(payload: schemas.ResumeCreate, db: Session = Depends(get_db)):
+    resume = models.Resume(candidate_name=payload.candidate_name, resume_text=payload.resume_text)
+    db.add(resume)
+    db.commit()
+    db.refresh(resume)
+    try:
+        vector_store.add_resume(str(resume.id), resume.resume_text)
+    except Exception as e:  # the row is saved; the next `vector_store.py build` picks it up
+        logger.warning(f"Could not append resume {resume.id} to the vector store: {type(e).__name__}: {e}")
+    return resume
+
+
+def _require_dense_mode():
+    if not settings.DENSE_INDEX_ENABLED:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Dense index mode is disabled. Set DENSE_INDEX_ENABLED=true to use it.",
+        )
+
+
+@app.post("/ai/dense-index/rebuild", response_model=schemas.DenseIndexStats)
+def rebuild_dense_index(db: Session = Depends(get_db)):
+    _require_dense_mode()
+    try:
+        if settings.VECTOR_STORE_ENABLED and vector_store.get_vector_store().n_rows:
+            matcher = dense_index.build_dense_index_from_store()
+        else:
+            rows = db.query(models.Resume.id, models.Resume.resume_text).all()
+            if not rows:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="No resumes stored yet.",
+                )
+            matcher = dense_index.build_dense_index(
+                [r.id for r in rows], [r.resume_text for r in rows]
+            )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return matcher.stats
+
+
+@app.post("/ai/top-resumes", response_model=schemas.TopResumesResponse)
+def top_resumes(payload: schemas.TopResumesRequest):
+    matcher = dense_index.get_dense_matcher() if settings.DENSE_INDEX_ENABLED else None
+    if matcher is None and settings.VECTOR_STORE_ENABLED:
+        # Exact sparse TF-IDF ranking straight from the shared store
+        store = vector_store.get_vector_store()
+        if store.vocab is None or store.n_rows == 0:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Vector store has not been built yet. Run `python vector_store.py build` first.",
+            )
+        started = time.perf_counter()
+        hits = store.top_k(payload.job_description, payload.k)
+        took_ms = (time.perf_counter() - started) * 1000
+        return schemas.TopResumesResponse(
+            results=[schemas.ResumeHit(resume_id=rid, score=score) for rid, score in hits],
+            exact=True,
+            took_ms=round(took_ms, 3),
+            mode="tfidf",
+        )
+    _require_dense_mode()
+    if matcher is None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Dense index has not been built yet or is out of date. Call /ai/dense-index/rebuild first.",
+        )
+    started = time.perf_counter()
+    hits = matcher.top_k(payload.job_description, payload.k, payload.n_probe, payload.exact)
+    took_ms = (time.perf_counter() - started) * 1000
+    return schemas.TopResumesResponse(
+        results=[schemas.ResumeHit(resume_id=rid, score=score) for rid, score in hits],
+        exact=payload.exact,
+        n_probe=None if payload.exact else (payload.n_probe or matcher.index.n_probe),
+        took_ms=round(took_ms, 3),
     )
 
 
 def _extract_text_from_upload(upload: UploadFile, data: bytes) -> str:
     import io
 
-    from PyPDF2 import PdfReader
     import docx
 
     filename = (upload.filename or "").lower()
-    if filename.endswith(".pdf"):
-        reader = PdfReader(io.BytesIO(data))
-        pages = [page.extract_text() or "" for page in reader.pages]
-        return "\n".join(pages)
-    elif filename.endswith(".docx"):
-        document = docx.Document(io.BytesIO(data))
-        return "\n".join(p.text for p in document.paragraphs)
-    else:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Unsupported file type. Please upload a PDF or DOCX file.",
-        )
+    with tracing.span("extract_text", filename=filename, bytes=len(data)):
+        if filename.endswith(".pdf"):
+            try:
+                return pdf_extract.extract_pdf_text(data)
+            except pdf_extract.PDFExtractionError as e:
+                raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e))
+        elif filename.endswith(".docx"):
+            document = docx.Document(io.BytesIO(data))
+            return "\n".join(p.text for p in document.paragraphs)
+        else:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Unsupported file type. Please upload a PDF or DOCX file.",
+            )
 
 
 @app.post("/ai/match-job-file", response_model=schemas.MatchScoreResponse)
 async def match_job_file(
     file: UploadFile = File(...),
     job_description: str = Form(...),
+    job_id: Optional[str] = Form(None, max_length=64),
+    candidate_id: Optional[str] = Form(None, max_length=64),
 ):
     data = await file.read()
     resume_text = _extract_text_from_upload(file, data)
-    score, recommendation, missing, matched = ai_engine.compute_match_score(
-        resume_text, job_description
-    )
-    return schemas.MatchScoreResponse(
-        score=score,
-        recommendation=recommendation,
-        missing_keywords=missing,
-        matched_keywords=matched,
-        resume_text=resume_text,
-    )
+    result = await cpu_executor.score(resume_text, job_description)
+    ids = _record_match(resume_text, job_description, job_id, candidate_id, result)
+    return schemas.MatchScoreResponse(**result, **ids, resume_text=resume_text)
 
 
 @app.post("/ai/interview-questions")
@@ -411,3 +601,94 @@ def interview_questions(payload: schemas.InterviewQuestionsRequest):
         logger.error(f"Error in interview questions: {error_msg}")
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Error: {type(e).__name__}: {str(e)}")
 
+
+
+@app.post("/ai/interview-questions/batch", response_model=schemas.InterviewQuestionsBatchResponse)
+async def interview_questions_batch(payload: schemas.InterviewQuestionsBatchRequest, stream: bool = False):
+    """Generate questions for many candidates concurrently within an overall deadline.
+
+    With `?stream=true` the response is NDJSON: one item result per line in
+    completion order, followed by a `{"summary": ...}` line.
+    """
+    if len(payload.items) > settings.INTERVIEW_BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Too many items. A batch may contain at most {settings.INTERVIEW_BATCH_MAX_ITEMS}.",
+        )
+    concurrency = min(
+        payload.max_concurrency or settings.INTERVIEW_BATCH_MAX_CONCURRENCY,
+        settings.INTERVIEW_BATCH_MAX_CONCURRENCY,
+    )
+    deadline = min(
+        payload.deadline_seconds or settings.INTERVIEW_BATCH_DEADLINE_SECONDS,
+        settings.INTERVIEW_BATCH_DEADLINE_SECONDS,
+    )
+    started = time.perf_counter()
+    results = interview_batch.iter_batch(payload.items, concurrency, deadline)
+
+    if stream:
+        async def ndjson():
+            collected = []
+            async for item in results:
+                collected.append(item)
+                yield item.model_dump_json() + "\n"
+            summary = interview_batch.summarize(collected, (time.perf_counter() - started) * 1000)
+            yield json.dumps({"summary": summary}) + "\n"
+
+        return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+
+    collected = [item async for item in results]
+    collected.sort(key=lambda r: r.index)
+    return schemas.InterviewQuestionsBatchResponse(
+        items=collected,
+        summary=interview_batch.summarize(collected, (time.perf_counter() - started) * 1000),
+    )
+
+
+def _submit_job(kind: str, items: list) -> schemas.JobSubmitted:
+    if len(items) > settings.JOB_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Too many items. A job may contain at most {settings.JOB_MAX_ITEMS}.",
+        )
+    job_id = job_queue.submit_job(kind, [item.model_dump(mode="json") for item in items])
+    return schemas.JobSubmitted(job_id=job_id, status=job_queue.QUEUED)
+
+
+def _job_status(job: dict) -> schemas.JobStatus:
+    done = job["completed"] + job["failed"]
+    return schemas.JobStatus(**job, progress=round(done / job["total"], 4) if job["total"] else 1.0)
+
+
+@app.post("/jobs/match", response_model=schemas.JobSubmitted, status_code=status.HTTP_202_ACCEPTED)
+def submit_match_job(payload: schemas.MatchJobSubmitRequest):
+    return _submit_job("match", payload.items)
+
+
+@app.post("/jobs/interview-questions", response_model=schemas.JobSubmitted, status_code=status.HTTP_202_ACCEPTED)
+def submit_interview_questions_job(payload: schemas.InterviewQuestionsJobSubmitRequest):
+    return _submit_job("interview_questions", payload.items)
+
+
+@app.get("/jobs/{job_id}", response_model=schemas.JobStatus)
+def job_status(job_id: str):
+    job = job_queue.get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found.")
+    return _job_status(job)
+
+
+@app.post("/jobs/{job_id}/cancel", response_model=schemas.JobStatus)
+def cancel_job(job_id: str):
+    job = job_queue.cancel_job(job_id)
+    if not job:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found.")
+    return _job_status(job)
+
+
+@app.get("/jobs/{job_id}/results", response_model=schemas.JobResultsPage)
+def job_results(job_id: str, cursor: Optional[int] = None, limit: int = Query(100, ge=1, le=1000)):
+    if not job_queue.get_job(job_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found.")
+    items, next_cursor = job_queue.get_results(job_id, cursor, limit)
+    return schemas.JobResultsPage(items=items, next_cursor=next_cursor)
@@ -0,0 +1,195 @@
+"""
+Persisted match history: batched writes off the request path and keyset-paginated reads.
+
+Routes only enqueue rows; a background thread inserts them in batches
+(executemany) every MATCH_HISTORY_FLUSH_SECONDS or MATCH_HISTORY_BATCH_SIZE
+rows. When the queue is full, rows are dropped and counted rather than
+slowing requests down.
+
+Reads use seek pagination: the cursor is the sort key of the last row
+returned, so a deep page costs the same index range scan as the first.
+"""
+import base64
+import hashlib
+import json
+import logging
+import math
+import queue
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from sqlalchemy import and_, insert, or_
+from sqlalchemy.orm import Session
+
+import metrics
+import models
+from config import settings
+from database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+_queue: "queue.Queue[dict]" = queue.Queue(maxsize=settings.MATCH_HISTORY_QUEUE_SIZE)
+_stop = threading.Event()
+_thread: Optional[threading.Thread] = None
+
+
+def text_key(prefix: str, text: str) -> str:
+    """Stable id for callers that do not send their own job / candidate id."""
+    normalized = " ".join(text.lower().split())
+    return f"{prefix}-{hashlib.sha256(normalized.encode('utf-8')).hexdigest()[:32]}"
+
+
+def record(job_id: str, candidate_id: str, result: dict) -> None:
+    if not settings.MATCH_HISTORY_ENABLED:
+        return
+    row = {
+        "id": str(uuid.uuid4()),
+        "job_id": job_id,
+        "candidate_id": candidate_id,
+        "score": result["score"],
+        "semantic_score": result.get("semantic_score"),
+        "recommendation": result.get("recommendation"),
+        "created_at": datetime.utcnow(),
+    }
+    try:
+        _queue.put_nowait(row)
+    except queue.Full:
+        metrics.inc("match_history_dropped_total")
+
+
+def _drain(limit: int) -> List[dict]:
+    rows = []
+    while len(rows) < limit:
+        try:
+            rows.append(_queue.get_nowait())
+        except queue.Empty:
+            break
+    return rows
+
+
+def _flush(rows: List[dict]) -> None:
+    db = SessionLocal()
+    try:
+        db.execute(insert(models.MatchResult), rows)
+        db.commit()
+        metrics.inc("match_history_written_total", len(rows))
+    except Exception as e:
+        db.rollback()
+        metrics.inc("match_history_failed_total", len(rows))
+        logger.error(f"Failed to write {len(rows)} match results: {type(e).__name__}: {e}")
+    finally:
+        db.close()
+
+
+def _writer_loop() -> None:
+    batch_size = settings.MATCH_HISTORY_BATCH_SIZE
+    while not _stop.is_set():
+        try:
+            batch = [_queue.get(timeout=settings.MATCH_HISTORY_FLUSH_SECONDS)]
+        except queue.Empty:
+            continue
+        # Collect until the batch is full or the flush interval has passed
+        deadline = time.monotonic() + settings.MATCH_HISTORY_FLUSH_SECONDS
+        while len(batch) < batch_size and not _stop.is_set():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(_queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        _flush(batch)
+    # Final flush on shutdown
+    while True:
+        rows = _drain(batch_size)
+        if not rows:
+            break
+        _flush(rows)
+
+
+def start() -> None:
+    global _thread
+    if not settings.MATCH_HISTORY_ENABLED or _thread is not None:
+        return
+    _stop.clear()
+    _thread = threading.Thread(target=_writer_loop, name="match-history-writer", daemon=True)
+    _thread.start()
+
+
+def stop() -> None:
+    global _thread
+    if _thread is None:
+        return
+    _stop.set()
+    _thread.join(timeout=10)
+    _thread = None
+
+
+# ---------------------------------------------------------------------------
+# Keyset-paginated reads
+# ---------------------------------------------------------------------------
+
+def _encode_cursor(values: list) -> str:
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str, shape: Tuple[type, ...]) -> list:
+    """Decode a cursor into a list whose items match `shape` ((float, str, str) for jobs, ...)."""
+    padded = cursor + "=" * (-len(cursor) % 4)
+    try:
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid cursor.") from e
+    if not isinstance(values, list) or len(values) != len(shape):
+        raise ValueError("Invalid cursor.")
+    for value, kind in zip(values, shape):
+        if kind is float:
+            valid = isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value)
+        else:
+            valid = isinstance(value, kind)
+        if not valid:
+            raise ValueError("Invalid cursor.")
+    return values
+
+
+def results_for_job(db: Session, job_id: str, limit: int, cursor: Optional[str]) -> Tuple[list, Optional[str]]:
+    """Best scores first (score desc, created_at desc, id desc)."""
+    MR = models.MatchResult
+    query = db.query(MR).filter(MR.job_id == job_id)
+    if cursor:
+        score, created_at, last_id = _decode_cursor(cursor, (float, str, str))
+        created_at = datetime.fromisoformat(created_at)  # ValueError on a malformed cursor
+        query = query.filter(
+            or_(
+                MR.score < score,
+                and_(MR.score == score, MR.created_at < created_at),
+                and_(MR.score == score, MR.created_at == created_at, MR.id < last_id),
+            )
+        )
+    rows = query.order_by(MR.score.desc(), MR.created_at.desc(), MR.id.desc()).limit(limit + 1).all()
+    next_cursor = None
+    if len(rows) > limit:
+        last = rows[limit - 1]
+        next_cursor = _encode_cursor([last.score, last.created_at.isoformat(), last.id])
+    return rows[:limit], next_cursor
+
+
+def results_for_candidate(db: Session, candidate_id: str, limit: int, cursor: Optional[str]) -> Tuple[list, Optional[str]]:
+    """Newest first (created_at desc, id desc)."""
+    MR = models.MatchResult
+    query = db.query(MR).filter(MR.candidate_id == candidate_id)
+    if cursor:
+        created_at, last_id = _decode_cursor(cursor, (str, str))
+        created_at = datetime.fromisoformat(created_at)
+        query = query.filter(
+            or_(MR.created_at < created_at, and_(MR.created_at == created_at, MR.id < last_id))
+        )
+    rows = query.order_by(MR.created_at.desc(), MR.id.desc()).limit(limit + 1).all()
+    next_cursor = None
+    if len(rows) > limit:
+        last = rows[limit - 1]
+        next_cursor = _encode_cursor([last.created_at.isoformat(), last.id])
+    return rows[:limit], next_cursor
@@ -0,0 +1,61 @@
+"""
+Minimal in-process metrics registry (counters and timers), served at GET /metrics.
+
+Values are per process; with several uvicorn workers each one reports its own.
+"""
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Tuple
+
+_lock = threading.Lock()
+_counters: Dict[Tuple[str, Tuple], float] = {}
+_timers: Dict[Tuple[str, Tuple], dict] = {}
+
+
+def _key(name: str, labels: dict) -> Tuple[str, Tuple]:
+    return name, tuple(sorted(labels.items()))
+
+
+def inc(name: str, value: float = 1, **labels) -> None:
+    key = _key(name, labels)
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + value
+
+
+def observe(name: str, seconds: float, **labels) -> None:
+    key = _key(name, labels)
+    with _lock:
+        stat = _timers.get(key)
+        if stat is None:
+            stat = _timers[key] = {"count": 0, "total_seconds": 0.0, "max_seconds": 0.0}
+        stat["count"] += 1
+        stat["total_seconds"] += seconds
+        stat["max_seconds"] = max(stat["max_seconds"], seconds)
+
+
+@contextmanager
+def timer(name: str, **labels):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(name, time.perf_counter() - started, **labels)
+
+
+def snapshot() -> dict:
+    with _lock:
+        counters = [
+            {"name": name, "labels": dict(labels), "value": value}
+            for (name, labels), value in sorted(_counters.items())
+        ]
+        timers = [
+            {
+                "name": name,
+                "labels": dict(labels),
+                **stat,
+                "mean_seconds": stat["total_seconds"] / stat["count"],
+            }
+            for (name, labels), stat in sorted(_timers.items())
+        ]
+    return {"counters": counters, "timers": timers}
@@ -5,8 +5,11 @@ from sqlalchemy import (
     Boolean,
     Column,
     DateTime,
+    Double,
     ForeignKey,
+    Index,
     String,
+    Text,
 )
 from sqlalchemy.orm import relationship
 
@@ -38,3 +41,39 @@ class EmailOTP(Base):
 
     user = relationship("User", back_populates="otps")
 
+
+
+class Resume(Base):
+    __tablename__ = "resumes"
+
+    id = Column(String(36), primary_key=True, index=True, default=lambda: str(uuid.uuid4()))
+    candidate_name = Column(String(100), nullable=True)
+    resume_text = Column(Text, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
+class JobPosting(Base):
+    __tablename__ = "job_postings"
+
+    id = Column(String(36), primary_key=True, index=True, default=lambda: str(uuid.uuid4()))
+    title = Column(String(150), nullable=False)
+    description = Column(Text, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
+class MatchResult(Base):
+    __tablename__ = "match_results"
+    # Keyset pagination: "all scores for job X" walks (job_id, score, created_at) and
+    # "all jobs for candidate Y" walks (candidate_id, created_at); the primary key breaks ties.
+    __table_args__ = (
+        Index("ix_match_results_job_score_created", "job_id", "score", "created_at"),
+        Index("ix_match_results_candidate_created", "candidate_id", "created_at"),
+    )
+
+    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    job_id = Column(String(64), nullable=False)
+    candidate_id = Column(String(64), nullable=False)
+    score = Column(Double, nullable=False)
+    semantic_score = Column(Double, nullable=True)
+    recommendation = Column(String(255), nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
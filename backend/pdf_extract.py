@@ -0,0 +1,200 @@
+#!/usr/bin/env python
+"""
+Pluggable PDF text extraction with preference order, fallback and timing metrics.
+
+Backends are tried in PDF_BACKENDS order (skipping ones that are not
+installed). A result that is empty or looks garbled falls through to the
+next backend; if none is clean, the longest text seen is returned, and if
+no backend produced any text at all `PDFExtractionError` is raised.
+
+Rank the installed backends on a local corpus (from the backend folder):
+    python pdf_extract.py bench path/to/sample_pdfs
+"""
+import io
+import logging
+import re
+import time
+import unicodedata
+from typing import Callable, Dict, List, Optional, Tuple
+
+import metrics
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+_BACKENDS: Dict[str, Callable[[bytes], str]] = {}
+_available: Dict[str, bool] = {}
+
+
+def register(name: str, module: str):
+    """Register an extractor; `module` is imported lazily to check availability."""
+
+    def decorator(fn: Callable[[bytes], str]) -> Callable[[bytes], str]:
+        fn.required_module = module
+        _BACKENDS[name] = fn
+        return fn
+
+    return decorator
+
+
+@register("pypdfium2", "pypdfium2")
+def _extract_pypdfium2(data: bytes) -> str:
+    import pypdfium2 as pdfium
+
+    pdf = pdfium.PdfDocument(data)
+    try:
+        pages = []
+        for page in pdf:
+            textpage = page.get_textpage()
+            pages.append(textpage.get_text_bounded())
+            textpage.close()
+            page.close()
+        return "\n".join(pages)
+    finally:
+        pdf.close()
+
+
+@register("pdfminer", "pdfminer.high_level")
+def _extract_pdfminer(data: bytes) -> str:
+    from pdfminer.high_level import extract_text
+
+    return extract_text(io.BytesIO(data))
+
+
+@register("pypdf2", "PyPDF2")
+def _extract_pypdf2(data: bytes) -> str:
+    from PyPDF2 import PdfReader
+
+    reader = PdfReader(io.BytesIO(data))
+    return "\n".join(page.extract_text() or "" for page in reader.pages)
+
+
+def is_available(name: str) -> bool:
+    if name not in _available:
+        import importlib
+
+        try:
+            importlib.import_module(_BACKENDS[name].required_module)
+            _available[name] = True
+        except ImportError:
+            _available[name] = False
+    return _available[name]
+
+
+def preferred_backends() -> List[str]:
+    names = [n.strip().lower() for n in settings.PDF_BACKENDS.split(",") if n.strip()]
+    unknown = [n for n in names if n not in _BACKENDS]
+    if unknown:
+        logger.warning(f"Ignoring unknown PDF backends: {', '.join(unknown)}")
+    return [n for n in names if n in _BACKENDS and is_available(n)]
+
+
+_CID_RE = re.compile(r"\(cid:\d+\)")
+
+
+def _is_garbage(ch: str) -> bool:
+    # Bullets, dashes, curly quotes, symbols and accented letters are all real text;
+    # only replacement characters and stray control codes point at a broken text layer.
+    if ch == "\ufffd":
+        return True
+    return unicodedata.category(ch) == "Cc" and not ch.isspace()
+
+
+def text_quality(text: str) -> float:
+    """Share of characters that are not U+FFFD, unmapped `(cid:N)` glyphs or control codes."""
+    if not text.strip():
+        return 0.0
+    cleaned = _CID_RE.sub("\ufffd", text)
+    bad = sum(1 for ch in cleaned if _is_garbage(ch))
+    return 1.0 - bad / len(cleaned)
+
+
+def _outcome(text: str) -> str:
+    if not text.strip():
+        return "empty"
+    if text_quality(text) < settings.PDF_MIN_TEXT_QUALITY:
+        return "garbled"
+    return "ok"
+
+
+def _run(name: str, data: bytes) -> Tuple[str, str, float]:
+    started = time.perf_counter()
+    try:
+        text = _BACKENDS[name](data) or ""
+        outcome = _outcome(text)
+    except Exception as e:
+        logger.warning(f"PDF backend {name} failed: {type(e).__name__}: {e}")
+        text, outcome = "", "error"
+    elapsed = time.perf_counter() - started
+    metrics.observe("pdf_extract_seconds", elapsed, backend=name)
+    metrics.inc("pdf_extract_total", backend=name, outcome=outcome)
+    return text, outcome, elapsed
+
+
+class PDFExtractionError(ValueError):
+    """No backend could get any text out of the file (corrupt, encrypted, scanned or not a PDF)."""
+
+
+def extract_pdf_text(data: bytes) -> str:
+    best: Optional[str] = None
+    for name in preferred_backends():
+        text, outcome, _ = _run(name, data)
+        if outcome == "ok":
+            return text
+        if best is None or len(text.strip()) > len(best.strip()):
+            best = text
+    if not best or not best.strip():
+        raise PDFExtractionError("Could not extract text from PDF.")
+    return best
+
+
+def benchmark(paths: List[str], backends: Optional[List[str]] = None, min_ok_rate: float = 0.95) -> List[dict]:
+    """Run every installed backend over the corpus and rank by speed among acceptable ones."""
+    import statistics
+
+    docs = []
+    for path in paths:
+        with open(path, "rb") as fh:
+            docs.append(fh.read())
+
+    report = []
+    for name in backends or [n for n in _BACKENDS if is_available(n)]:
+        timings, ok, qualities = [], 0, []
+        for data in docs:
+            text, outcome, elapsed = _run(name, data)
+            timings.append(elapsed * 1000)
+            ok += outcome == "ok"
+            qualities.append(text_quality(text))
+        report.append({
+            "backend": name,
+            "docs": len(docs),
+            "ok_rate": round(ok / len(docs), 3),
+            "mean_quality": round(statistics.mean(qualities), 3),
+            "median_ms": round(statistics.median(timings), 2),
+            "total_ms": round(sum(timings), 2),
+            "acceptable": ok / len(docs) >= min_ok_rate,
+        })
+    # Fastest acceptable backend first
+    report.sort(key=lambda r: (not r["acceptable"], r["median_ms"]))
+    return report
+
+
+if __name__ == "__main__":
+    import argparse
+    import glob
+    import json
+    import os
+
+    parser = argparse.ArgumentParser(description="Rank installed PDF extraction backends.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    bench = sub.add_parser("bench", help="benchmark backends on a folder of PDFs")
+    bench.add_argument("corpus", help="folder containing sample .pdf files")
+    bench.add_argument("--backends", help="comma-separated subset to compare")
+    bench.add_argument("--min-ok-rate", type=float, default=0.95, help="share of clean extractions required")
+    args = parser.parse_args()
+
+    files = sorted(glob.glob(os.path.join(args.corpus, "**", "*.pdf"), recursive=True))
+    if not files:
+        parser.error(f"No PDF files found under {args.corpus}")
+    selected = [b.strip() for b in args.backends.split(",")] if args.backends else None
+    print(json.dumps(benchmark(files, selected, args.min_ok_rate), indent=2))
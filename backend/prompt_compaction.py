@@ -0,0 +1,144 @@
+"""
+Deterministic compaction of resume / job description text before an LLM call.
+
+Both documents are split into lines and sentences and scored with TF-IDF
+(fitted on those segments): resume segments by their similarity to the job
+description, job segments by their own term weight. Skill lists, the most
+recent roles and requirement bullets get a boost. The best segments are
+kept, in their original order, until the token budget is used up.
+"""
+import re
+from typing import List, Tuple
+
+import numpy as np
+
+from ai_engine import tokenize
+
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+(?=[A-Z0-9])")
+_BULLET_RE = re.compile(r"^\s*(?:[-*•▪‣◦]|\d+[.)])\s+")
+_YEAR_RE = re.compile(r"\b(?:19|20)\d{2}\b")
+_CURRENT_RE = re.compile(r"\b(?:present|current|now|ongoing)\b", re.IGNORECASE)
+_SKILLS_RE = re.compile(r"\b(?:skills?|technolog\w*|tools|stack|languages|frameworks|certifications?)\b", re.IGNORECASE)
+_REQUIREMENT_RE = re.compile(
+    r"\b(?:requir\w*|must|should|experience (?:with|in)|proficien\w*|responsib\w*|qualif\w*|knowledge of|years)\b",
+    re.IGNORECASE,
+)
+
+# Share of the content budget given to the resume; the job description is usually shorter
+_RESUME_SHARE = 0.6
+# Longer segments (unpunctuated text, long bullets) are cut into word windows of about this size
+_MAX_SEGMENT_CHARS = 400
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough, deterministic token count (~4 characters per token for English text)."""
+    return (len(text) + 3) // 4
+
+
+def _windows(segment: str) -> List[str]:
+    if len(segment) <= _MAX_SEGMENT_CHARS:
+        return [segment]
+    windows, words, size = [], [], 0
+    for word in segment.split():
+        if words and size + len(word) > _MAX_SEGMENT_CHARS:
+            windows.append(" ".join(words))
+            words, size = [], 0
+        words.append(word)
+        size += len(word) + 1
+    if words:
+        windows.append(" ".join(words))
+    return windows
+
+
+def _segments(text: str) -> List[str]:
+    segments = []
+    for line in text.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        if _BULLET_RE.match(line) or len(line) < 200:
+            parts = [line]
+        else:
+            parts = [s.strip() for s in _SENTENCE_RE.split(line) if s.strip()]
+        for part in parts:
+            segments.extend(_windows(part))
+    return segments
+
+
+def _resume_boosts(segments: List[str]) -> np.ndarray:
+    years = [int(y) for s in segments for y in _YEAR_RE.findall(s)]
+    latest = max(years) if years else None
+    boosts = np.zeros(len(segments), dtype=np.float32)
+    for i, segment in enumerate(segments):
+        if _SKILLS_RE.search(segment) or segment.count(",") >= 3:
+            boosts[i] += 0.3
+        if _CURRENT_RE.search(segment) or (latest and any(int(y) >= latest - 2 for y in _YEAR_RE.findall(segment))):
+            boosts[i] += 0.2
+    if len(boosts):
+        boosts[0] += 0.2  # headline / current title
+    return boosts
+
+
+def _job_boosts(segments: List[str]) -> np.ndarray:
+    boosts = np.zeros(len(segments), dtype=np.float32)
+    for i, segment in enumerate(segments):
+        if _BULLET_RE.match(segment):
+            boosts[i] += 0.2
+        if _REQUIREMENT_RE.search(segment):
+            boosts[i] += 0.3
+    return boosts
+
+
+def _select(segments: List[str], scores: np.ndarray, budget: int) -> str:
+    chosen, seen, used = [], set(), 0
+    for i in np.argsort(-scores, kind="stable"):
+        cost = estimate_tokens(segments[i]) + 1
+        if used + cost > budget or segments[i] in seen:
+            continue
+        chosen.append(i)
+        seen.add(segments[i])
+        used += cost
+    if not chosen and len(segments) and budget > 1:
+        # Nothing fits whole (e.g. one huge word run): keep the head of the best segment
+        return segments[int(np.argmax(scores))][: (budget - 1) * 4].rstrip()
+    return "\n".join(segments[i] for i in sorted(chosen))
+
+
+def compact_for_prompt(resume_text: str, job_description: str, token_budget: int) -> Tuple[str, str]:
+    """Return (resume, job description) trimmed to fit `token_budget` tokens together."""
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    resume_segments = _segments(resume_text)
+    job_segments = _segments(job_description)
+    if not resume_segments or not job_segments:
+        return resume_text, job_description
+
+    vectorizer = TfidfVectorizer(analyzer=tokenize, sublinear_tf=True)
+    try:
+        matrix = vectorizer.fit_transform(resume_segments + job_segments)
+    except ValueError:  # no usable tokens at all
+        return resume_text, job_description
+    resume_matrix = matrix[: len(resume_segments)]
+    job_matrix = matrix[len(resume_segments):]
+
+    # Resume: relevance to the whole job description; job: term weight per segment
+    job_centroid = np.asarray(job_matrix.sum(axis=0)).ravel()
+    job_centroid /= np.linalg.norm(job_centroid) or 1.0
+    resume_scores = resume_matrix @ job_centroid + _resume_boosts(resume_segments)
+    job_scores = np.asarray(job_matrix.sum(axis=1)).ravel()
+    job_scores = job_scores / (job_scores.max() or 1.0) + _job_boosts(job_segments)
+
+    job_tokens = estimate_tokens(job_description)
+    job_budget = min(job_tokens, int(token_budget * (1 - _RESUME_SHARE)))
+    resume_budget = token_budget - job_budget
+    if estimate_tokens(resume_text) < resume_budget:
+        # Resume fits; hand the slack back to the job description
+        resume_budget = estimate_tokens(resume_text)
+        job_budget = token_budget - resume_budget
+
+    compact_job = job_description if job_tokens <= job_budget else _select(job_segments, job_scores, job_budget)
+    compact_resume = (
+        resume_text if estimate_tokens(resume_text) <= resume_budget
+        else _select(resume_segments, np.asarray(resume_scores).ravel(), resume_budget)
+    )
+    return compact_resume, compact_job
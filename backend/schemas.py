@@ -75,6 +75,8 @@ class ResumeAnalysisRequest(BaseModel):
 class JobMatchRequest(BaseModel):
     resume_text: str
     job_description: str
+    job_id: Optional[str] = Field(None, max_length=64)
+    candidate_id: Optional[str] = Field(None, max_length=64)
 
 
 class MatchScoreResponse(BaseModel):
@@ -83,6 +85,51 @@ class MatchScoreResponse(BaseModel):
     missing_keywords: Optional[list[str]] = None
     matched_keywords: Optional[list[str]] = None
     resume_text: Optional[str] = None
+    semantic_score: Optional[float] = None
+    job_id: Optional[str] = None
+    candidate_id: Optional[str] = None
+
+
+class ResumeCreate(BaseModel):
+    candidate_name: Optional[str] = Field(None, max_length=100)
+    resume_text: str
+
+
+class ResumeOut(BaseModel):
+    id: str
+    candidate_name: Optional[str] = None
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class DenseIndexStats(BaseModel):
+    n_resumes: int
+    n_components: int
+    n_lists: int
+    explained_variance: float
+    build_seconds: float
+
+
+class TopResumesRequest(BaseModel):
+    job_description: str
+    k: int = Field(10, ge=1, le=1000)
+    n_probe: Optional[int] = Field(None, ge=1)
+    exact: bool = False
+
+
+class ResumeHit(BaseModel):
+    resume_id: str
+    score: float
+
+
+class TopResumesResponse(BaseModel):
+    results: list[ResumeHit]
+    exact: bool
+    n_probe: Optional[int] = None
+    took_ms: float
+    mode: str = "dense"  # "dense" (IVF index) or "tfidf" (exact, vector store)
 
 
 from enum import Enum
@@ -111,10 +158,105 @@ class InterviewQuestionsRequest(BaseModel):
     questions_per_category: int = 3
 
 
+class PromptMetadata(BaseModel):
+    compacted: bool
+    prompt_tokens_before: int
+    prompt_tokens_after: int
+    token_budget: int
+    usage_prompt_tokens: Optional[int] = None
+
+
 class InterviewQuestionsResponse(BaseModel):
     candidate_experience_level: str
     categories: list[InterviewCategory]
     model_used: Optional[str] = None
+    prompt_metadata: Optional[PromptMetadata] = None
+    fallback: Optional[str] = None  # "cache" or "template" while the OpenAI breaker is open
 
     model_config = {"protected_namespaces": ()}
 
+
+
+class MatchJobSubmitRequest(BaseModel):
+    items: list[JobMatchRequest] = Field(..., min_length=1)
+
+
+class InterviewQuestionsJobSubmitRequest(BaseModel):
+    items: list[InterviewQuestionsRequest] = Field(..., min_length=1)
+
+
+class JobSubmitted(BaseModel):
+    job_id: str
+    status: str
+
+
+class JobStatus(BaseModel):
+    id: str
+    kind: str
+    status: str
+    total: int
+    completed: int
+    failed: int
+    progress: float
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+
+class JobResultItem(BaseModel):
+    index: int
+    status: str
+    result: Optional[dict] = None
+    error: Optional[str] = None
+
+
+class JobResultsPage(BaseModel):
+    items: list[JobResultItem]
+    next_cursor: Optional[int] = None
+
+
+class InterviewQuestionsBatchRequest(BaseModel):
+    items: list[InterviewQuestionsRequest] = Field(..., min_length=1)
+    max_concurrency: Optional[int] = Field(None, ge=1)
+    deadline_seconds: Optional[float] = Field(None, gt=0)
+
+
+class InterviewQuestionsBatchItemResult(BaseModel):
+    index: int
+    status: str  # ok | error | timeout | not_started
+    result: Optional[InterviewQuestionsResponse] = None
+    error: Optional[str] = None
+    elapsed_ms: Optional[float] = None
+
+
+class InterviewQuestionsBatchSummary(BaseModel):
+    total: int
+    ok: int
+    error: int
+    timeout: int
+    not_started: int = 0
+    elapsed_ms: float
+
+
+class InterviewQuestionsBatchResponse(BaseModel):
+    items: list[InterviewQuestionsBatchItemResult]
+    summary: InterviewQuestionsBatchSummary
+
+
+class MatchResultOut(BaseModel):
+    id: str
+    job_id: str
+    candidate_id: str
+    score: float
+    semantic_score: Optional[float] = None
+    recommendation: Optional[str] = None
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class MatchHistoryPage(BaseModel):
+    items: list[MatchResultOut]
+    next_cursor: Optional[str] = None
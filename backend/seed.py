@@ -0,0 +1,344 @@
+#!/usr/bin/env python
+"""
+Bulk synthetic data for scale testing login lookups, signup / OTP e-mail
+checks, match scoring and the resume ranking paths.
+
+Users get bcrypt hashes at a low cost factor (--bcrypt-rounds, default 4),
+computed once for a small pool of passwords and reused, so a million users
+cost a handful of hashes instead of hours of CPU. Resumes and job postings
+are generated from a small vocabulary model (role-specific skill lists drawn
+with Zipf-like weights, experience and requirement templates), so the text
+has realistic overlap between matching roles. Rows are written with Core
+`insert()` executemany batches, one transaction per batch, with progress on
+stderr.
+
+Usage (from the backend folder, DATABASE_URL pointing at a test database):
+    python seed.py --users 1000000 --resumes 100000 --jobs 5000
+    python seed.py --match-results 2000000   # also fill match_results for history paging
+
+Seeded users share the domain SEED_EMAIL_DOMAIN and are numbered after the
+ones already there, so running the command again appends. Sample
+credentials are printed in the JSON summary on stdout.
+"""
+import argparse
+import itertools
+import json
+import random
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterator, List
+
+import bcrypt
+from sqlalchemy import func, insert, select
+
+import models
+from ai_engine import recommendation_for
+from database import Base, engine
+
+SEED_EMAIL_DOMAIN = "seed.smarthire.test"
+
+_FIRST_NAMES = (
+    "Aarav Aditi Ahmed Aisha Alex Ananya Arjun Ben Carlos Chen Chloe Daniel Deepa Diego Elena Emma "
+    "Fatima Grace Hannah Hiro Isha Ivan James Jia Kabir Karthik Kavya Lakshmi Leo Lucas Maria Meera "
+    "Mohammed Nadia Neha Noah Olivia Omar Priya Rahul Ravi Rohan Sai Sara Sneha Sofia Tanvi Vikram Wei Zara"
+).split()
+_LAST_NAMES = (
+    "Agarwal Ali Bhat Brown Chen Das Fernandez Garcia Gupta Iyer Jain Johnson Khan Kim Kumar Lee Lopez "
+    "Martin Mehta Menon Miller Nair Nguyen Patel Rao Reddy Rossi Sharma Silva Singh Smith Tanaka Verma "
+    "Wang Williams Wilson Wu Yadav Zhang"
+).split()
+_COMPANIES = (
+    "Acme Analytics, Bluewave Systems, Brightpath Labs, Cloudnine Tech, Datavista, Everbyte, Finlytics, "
+    "Greenfield Software, Helix Health, Infinitum, Kite Retail, Lumen Logistics, Nimbus Cloud, "
+    "Northstar Bank, Orbit Media, Pixelcraft, Quantify, Redwood Insurance, Sparkline, Tetra Telecom"
+).split(", ")
+_UNIVERSITIES = (
+    "Anna University, IIT Madras, IIT Bombay, VIT Vellore, BITS Pilani, University of Hyderabad, "
+    "JNTU Hyderabad, Osmania University, Stanford University, University of Toronto, TU Munich, NUS"
+).split(", ")
+_DEGREES = ["B.Tech", "B.E.", "B.Sc", "M.Tech", "M.Sc", "MCA", "MBA"]
+_FIELDS = ["Computer Science", "Information Technology", "Electronics", "Statistics", "Mathematics", "Data Science"]
+
+# Skills per role, most common first; drawn with Zipf-like weights
+_ROLES: Dict[str, List[str]] = {
+    "Backend Engineer": (
+        "python java sql postgresql mysql rest api fastapi django spring microservices docker redis kafka "
+        "aws git linux kubernetes grpc rabbitmq celery graphql"
+    ).split(),
+    "Frontend Engineer": (
+        "javascript react typescript html css redux tailwind nextjs vite jest webpack git figma "
+        "accessibility graphql cypress vue angular storybook"
+    ).split(),
+    "Full Stack Developer": (
+        "javascript react nodejs python sql mongodb express rest api typescript docker git aws html css "
+        "postgresql redis graphql nextjs"
+    ).split(),
+    "Data Scientist": (
+        "python pandas numpy scikit-learn sql statistics machine learning tensorflow pytorch matplotlib "
+        "jupyter nlp xgboost spark tableau experimentation"
+    ).split(),
+    "Data Engineer": (
+        "python sql spark airflow kafka aws snowflake etl dbt hadoop scala bigquery redshift docker "
+        "terraform databricks"
+    ).split(),
+    "DevOps Engineer": (
+        "linux docker kubernetes aws terraform ansible jenkins ci cd bash python prometheus grafana "
+        "helm azure gcp monitoring networking"
+    ).split(),
+    "Mobile Developer": (
+        "kotlin swift android ios flutter dart react native firebase rest api git xcode jetpack compose "
+        "testing ci cd"
+    ).split(),
+    "QA Engineer": (
+        "selenium testing automation python java cypress jest api testing postman jira ci cd "
+        "performance testing appium regression"
+    ).split(),
+}
+_VERBS = (
+    "Built Designed Implemented Led Optimized Migrated Automated Delivered Scaled Refactored "
+    "Maintained Launched Improved Owned"
+).split()
+_OBJECTS = [
+    "a customer-facing dashboard", "the payments service", "an internal reporting pipeline",
+    "the search and recommendation module", "a real-time notification system", "the onboarding flow",
+    "CI/CD pipelines", "data ingestion jobs", "the authentication service", "a mobile checkout experience",
+    "monitoring and alerting", "the order management platform",
+]
+_IMPACTS = [
+    "reducing latency by {n}%", "cutting infrastructure cost by {n}%", "serving {n}k daily users",
+    "improving conversion by {n}%", "reducing release time by {n}%", "raising test coverage to {n}%",
+]
+_LEVELS = ["Junior", "Mid-level", "Senior", "Lead"]
+_MISSIONS = [
+    "build and scale our core platform", "own critical services end to end", "ship features used by millions",
+    "modernise our data infrastructure", "improve reliability and developer experience",
+]
+
+
+def _zipf_sample(rng: random.Random, items: List[str], k: int) -> List[str]:
+    weights = [1.0 / (rank + 1) for rank in range(len(items))]
+    chosen: List[str] = []
+    while len(chosen) < min(k, len(items)):
+        item = rng.choices(items, weights)[0]
+        if item not in chosen:
+            chosen.append(item)
+    return chosen
+
+
+def _name(rng: random.Random) -> str:
+    return f"{rng.choice(_FIRST_NAMES)} {rng.choice(_LAST_NAMES)}"
+
+
+def resume_text(rng: random.Random, name: str) -> str:
+    role = rng.choice(list(_ROLES))
+    skills = _zipf_sample(rng, _ROLES[role], rng.randint(8, 14))
+    years = rng.randint(1, 15)
+    lines = [
+        name,
+        f"{role} | {years} years experience",
+        f"Summary: {role} with {years} years of experience in {skills[0]}, {skills[1]} and {skills[2]}.",
+        f"Skills: {', '.join(skills)}",
+        "Experience",
+    ]
+    end_year = 2025
+    for index in range(rng.randint(2, 4)):
+        start_year = end_year - rng.randint(1, 4)
+        period = f"{start_year} - Present" if index == 0 else f"{start_year} - {end_year}"
+        used = rng.sample(skills, 2)
+        impact = rng.choice(_IMPACTS).format(n=rng.randint(10, 80))
+        lines.append(
+            f"- {role} at {rng.choice(_COMPANIES)} ({period}): {rng.choice(_VERBS)} {rng.choice(_OBJECTS)} "
+            f"using {used[0]} and {used[1]}, {impact}."
+        )
+        end_year = start_year
+    lines.append(
+        f"Education: {rng.choice(_DEGREES)} in {rng.choice(_FIELDS)}, {rng.choice(_UNIVERSITIES)} ({end_year - 1})"
+    )
+    return "\n".join(lines)
+
+
+def job_posting(rng: random.Random) -> Dict[str, str]:
+    role = rng.choice(list(_ROLES))
+    level = rng.choice(_LEVELS)
+    company = rng.choice(_COMPANIES)
+    skills = _zipf_sample(rng, _ROLES[role], rng.randint(7, 11))
+    required, nice = skills[:-2], skills[-2:]
+    lines = [
+        f"{level} {role} - {company}",
+        f"About the role: We are looking for a {level.lower()} {role.lower()} to {rng.choice(_MISSIONS)}.",
+        "Requirements:",
+        f"- {rng.randint(1, 8)}+ years of experience with {required[0]}",
+        f"- Proficiency in {required[1]} and {required[2]}",
+    ]
+    lines += [f"- Experience with {skill}" for skill in required[3:]]
+    lines += [f"Nice to have: {', '.join(nice)}", "Responsibilities:"]
+    lines += [
+        f"- {verb} {obj}" for verb, obj in zip(rng.sample(_VERBS, 3), rng.sample(_OBJECTS, 3))
+    ]
+    return {"title": f"{level} {role}", "description": "\n".join(lines)}
+
+
+# ---------------------------------------------------------------------------
+# Bulk writer
+# ---------------------------------------------------------------------------
+
+def _bulk_insert(table, rows: Iterator[dict], total: int, batch_size: int, label: str) -> float:
+    """Insert `rows` in executemany batches of `batch_size`; return rows per second."""
+    started = time.perf_counter()
+    written = 0
+    batch: List[dict] = []
+
+    def flush() -> None:
+        nonlocal written
+        with engine.begin() as conn:
+            conn.execute(insert(table), batch)
+        written += len(batch)
+        batch.clear()
+        elapsed = time.perf_counter() - started
+        print(
+            f"\r{label}: {written}/{total} ({written / total:.0%}) {written / elapsed:,.0f} rows/s",
+            end="", file=sys.stderr, flush=True,
+        )
+
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            flush()
+    if batch:
+        flush()
+    if total:
+        print(file=sys.stderr)
+    return written / max(time.perf_counter() - started, 1e-9)
+
+
+def _created_at(rng: random.Random, now: datetime) -> datetime:
+    return now - timedelta(seconds=rng.randint(0, 365 * 24 * 3600))
+
+
+def _user_rows(rng: random.Random, count: int, start: int, hashes: List[str], verified_ratio: float) -> Iterator[dict]:
+    now = datetime.utcnow()
+    for i in range(start, start + count):
+        first, last = rng.choice(_FIRST_NAMES), rng.choice(_LAST_NAMES)
+        yield {
+            "id": str(uuid.uuid4()),
+            "name": f"{first} {last}",
+            "email": f"{first.lower()}.{last.lower()}.{i}@{SEED_EMAIL_DOMAIN}",
+            "password_hash": hashes[i % len(hashes)],
+            "is_email_verified": rng.random() < verified_ratio,
+            "created_at": _created_at(rng, now),
+        }
+
+
+def _resume_rows(rng: random.Random, count: int) -> Iterator[dict]:
+    now = datetime.utcnow()
+    for _ in range(count):
+        name = _name(rng)
+        yield {
+            "id": str(uuid.uuid4()),
+            "candidate_name": name,
+            "resume_text": resume_text(rng, name),
+            "created_at": _created_at(rng, now),
+        }
+
+
+def _job_rows(rng: random.Random, count: int) -> Iterator[dict]:
+    now = datetime.utcnow()
+    for _ in range(count):
+        yield {"id": str(uuid.uuid4()), **job_posting(rng), "created_at": _created_at(rng, now)}
+
+
+def _match_rows(rng: random.Random, count: int, job_ids: List[str], candidate_ids: List[str]) -> Iterator[dict]:
+    now = datetime.utcnow()
+    for _ in range(count):
+        score = round(rng.betavariate(2, 5), 4)
+        yield {
+            "id": str(uuid.uuid4()),
+            "job_id": rng.choice(job_ids),
+            "candidate_id": rng.choice(candidate_ids),
+            "score": score,
+            "semantic_score": None,
+            "recommendation": recommendation_for(score),
+            "created_at": _created_at(rng, now),
+        }
+
+
+def _ids(model, limit: int) -> List[str]:
+    with engine.connect() as conn:
+        return list(conn.execute(select(model.id).limit(limit)).scalars())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Seed the database with synthetic users, resumes and jobs.")
+    parser.add_argument("--users", type=int, default=0)
+    parser.add_argument("--resumes", type=int, default=0)
+    parser.add_argument("--jobs", type=int, default=0)
+    parser.add_argument("--match-results", type=int, default=0)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--bcrypt-rounds", type=int, default=4, help="test-only cost factor (minimum 4)")
+    parser.add_argument("--password-pool", type=int, default=8, help="distinct passwords hashed once and reused")
+    parser.add_argument("--verified-ratio", type=float, default=0.95)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    Base.metadata.create_all(bind=engine)
+    summary: Dict[str, object] = {}
+    tasks: List[Callable[[], None]] = []
+
+    if args.users:
+        passwords = [f"SeedPass-{k}!" for k in range(max(1, args.password_pool))]
+        salt = bcrypt.gensalt(rounds=args.bcrypt_rounds)
+        hashes = [bcrypt.hashpw(p.encode("utf-8"), salt).decode("utf-8") for p in passwords]
+        with engine.connect() as conn:
+            start = conn.execute(
+                select(func.count()).select_from(models.User).where(
+                    models.User.email.like(f"%@{SEED_EMAIL_DOMAIN}")
+                )
+            ).scalar_one()
+
+        def seed_users() -> None:
+            rows = _user_rows(rng, args.users, start, hashes, args.verified_ratio)
+            first = next(rows)
+            rps = _bulk_insert(models.User.__table__, itertools.chain([first], rows), args.users, args.batch_size, "users")
+            summary["users"] = {"rows": args.users, "rows_per_second": round(rps)}
+            summary["sample_login"] = {"email": first["email"], "password": passwords[start % len(passwords)]}
+
+        tasks.append(seed_users)
+
+    for count, model, label, rows in (
+        (args.resumes, models.Resume, "resumes", _resume_rows),
+        (args.jobs, models.JobPosting, "job_postings", _job_rows),
+    ):
+        if count:
+            def seed(count=count, model=model, label=label, rows=rows) -> None:
+                rps = _bulk_insert(model.__table__, rows(rng, count), count, args.batch_size, label)
+                summary[label] = {"rows": count, "rows_per_second": round(rps)}
+
+            tasks.append(seed)
+
+    if args.match_results:
+        def seed_matches() -> None:
+            job_ids = _ids(models.JobPosting, 100_000)
+            candidate_ids = _ids(models.Resume, 100_000)
+            if not job_ids or not candidate_ids:
+                parser.error("--match-results needs job postings and resumes (seed --jobs / --resumes first)")
+            rows = _match_rows(rng, args.match_results, job_ids, candidate_ids)
+            rps = _bulk_insert(models.MatchResult.__table__, rows, args.match_results, args.batch_size, "match_results")
+            summary["match_results"] = {"rows": args.match_results, "rows_per_second": round(rps)}
+
+        tasks.append(seed_matches)
+
+    if not tasks:
+        parser.error("nothing to seed; pass --users, --resumes, --jobs and/or --match-results")
+
+    started = time.perf_counter()
+    for task in tasks:
+        task()
+    summary["elapsed_seconds"] = round(time.perf_counter() - started, 1)
+    print(json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+#!/usr/bin/env python
+"""
+Local SMTP sink for load tests: accepts every message and captures OTP codes.
+
+No TLS; AUTH PLAIN/LOGIN is advertised and accepts any credentials, so the
+app's normal login path is exercised. Point the app at it with
+EMAIL_HOST=127.0.0.1, EMAIL_PORT=<port>, EMAIL_USE_TLS=false.
+
+Standalone:
+    python smtp_sink.py --port 2525
+"""
+import asyncio
+import re
+import threading
+import time
+from email import message_from_bytes
+from email.policy import default as default_policy
+from typing import Dict, Optional
+
+_OTP_RE = re.compile(r"code is (\d{4,6})")
+
+
+class SMTPSink:
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        self.host = host
+        self.port = port
+        self.otps: Dict[str, str] = {}
+        self.message_count = 0
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        async def reply(line: str) -> None:
+            writer.write(f"{line}\r\n".encode())
+            await writer.drain()
+
+        await reply("220 smtp-sink ready")
+        try:
+            while True:
+                raw = await reader.readline()
+                if not raw:
+                    break
+                line = raw.decode(errors="replace").rstrip("\r\n")
+                verb = line.split(" ", 1)[0].upper()
+                if verb == "EHLO":
+                    writer.write(b"250-smtp-sink\r\n250-AUTH PLAIN LOGIN\r\n250-8BITMIME\r\n250 SMTPUTF8\r\n")
+                    await writer.drain()
+                elif verb == "HELO":
+                    await reply("250 smtp-sink")
+                elif verb == "AUTH":
+                    parts = line.split()
+                    if parts[1].upper() == "LOGIN":
+                        for _ in range(2 if len(parts) == 2 else 1):
+                            await reply("334 ")
+                            await reader.readline()
+                    elif len(parts) == 2:
+                        await reply("334 ")
+                        await reader.readline()
+                    await reply("235 2.7.0 Authentication successful")
+                elif verb == "DATA":
+                    await reply("354 End data with <CR><LF>.<CR><LF>")
+                    chunks = []
+                    while True:
+                        chunk = await reader.readline()
+                        if chunk in (b".\r\n", b".\n", b""):
+                            break
+                        chunks.append(chunk[1:] if chunk.startswith(b"..") else chunk)
+                    self._capture(b"".join(chunks))
+                    await reply("250 OK")
+                elif verb == "QUIT":
+                    await reply("221 Bye")
+                    break
+                elif verb in ("MAIL", "RCPT", "RSET", "NOOP"):
+                    await reply("250 OK")
+                else:
+                    await reply("502 Command not implemented")
+        finally:
+            writer.close()
+
+    def _capture(self, data: bytes) -> None:
+        message = message_from_bytes(data, policy=default_policy)
+        body = message.get_body(preferencelist=("plain",))
+        match = _OTP_RE.search(body.get_content() if body else "")
+        with self._lock:
+            self.message_count += 1
+            if match:
+                self.otps[str(message["To"]).lower()] = match.group(1)
+
+    def pop_otp(self, email: str) -> Optional[str]:
+        with self._lock:
+            return self.otps.pop(email.lower(), None)
+
+    async def wait_for_otp(self, email: str, timeout: float = 10.0) -> str:
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            otp = self.pop_otp(email)
+            if otp:
+                return otp
+            await asyncio.sleep(0.01)
+        raise TimeoutError(f"No OTP received for {email}")
+
+    def start(self) -> "SMTPSink":
+        """Serve on a background thread; returns once the port is bound."""
+        ready = threading.Event()
+
+        def run() -> None:
+            self._loop = asyncio.new_event_loop()
+            self._server = self._loop.run_until_complete(
+                asyncio.start_server(self._handle, self.host, self.port)
+            )
+            self.port = self._server.sockets[0].getsockname()[1]
+            ready.set()
+            self._loop.run_forever()
+
+        threading.Thread(target=run, name="smtp-sink", daemon=True).start()
+        ready.wait()
+        return self
+
+    def stop(self) -> None:
+        if self._loop and self._server:
+            self._loop.call_soon_threadsafe(self._server.close)
+            self._loop.call_soon_threadsafe(self._loop.stop)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run a local SMTP sink that prints captured OTPs.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=2525)
+    args = parser.parse_args()
+
+    sink = SMTPSink(args.host, args.port).start()
+    print(f"SMTP sink listening on {sink.host}:{sink.port}")
+    try:
+        while True:
+            time.sleep(1)
+            for email in list(sink.otps):
+                print(f"{email}: {sink.pop_otp(email)}")
+    except KeyboardInterrupt:
+        sink.stop()
@@ -19,3 +19,32 @@ CREATE TABLE email_otp (
     PRIMARY KEY (id),
     FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
 );
+
+CREATE TABLE resumes (
+    id CHAR(36) NOT NULL,
+    candidate_name VARCHAR(100),
+    resume_text TEXT NOT NULL,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (id)
+);
+
+CREATE TABLE job_postings (
+    id CHAR(36) NOT NULL,
+    title VARCHAR(150) NOT NULL,
+    description TEXT NOT NULL,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (id)
+);
+
+CREATE TABLE match_results (
+    id CHAR(36) NOT NULL,
+    job_id VARCHAR(64) NOT NULL,
+    candidate_id VARCHAR(64) NOT NULL,
+    score DOUBLE NOT NULL,
+    semantic_score DOUBLE,
+    recommendation VARCHAR(255),
+    created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (id),
+    KEY ix_match_results_job_score_created (job_id, score, created_at),
+    KEY ix_match_results_candidate_created (candidate_id, created_at)
+);
@@ -0,0 +1,366 @@
+"""
+Lightweight span-based request tracing.
+
+A sampled root span is opened per HTTP request by `TracingMiddleware`; code
+below it opens child spans with `with span("name", **attributes):`. The
+current span lives in a context variable, so it follows `await`s and is
+copied into the AnyIO threadpool by Starlette. Executors that do not copy
+context use `bind()`, and process-pool work carries an `inject()` carrier and
+sends its finished spans back with the result (see `run_remote`).
+
+When a request is not sampled no span objects are created at all, so the
+per-call cost of an instrumented function is one context-variable lookup.
+Finished spans are buffered and written by a background thread to a JSON
+lines file (TRACE_EXPORTER=jsonl) or POSTed to an OTLP/HTTP collector as
+OTLP JSON (TRACE_EXPORTER=otlp, e.g. http://localhost:4318/v1/traces).
+"""
+import contextvars
+import json
+import logging
+import os
+import queue
+import random
+import threading
+import time
+import urllib.request
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, List, Optional
+
+import metrics
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+_EXPORT_BATCH = 512
+_STATEMENT_MAX_CHARS = 500
+_OTLP_KINDS = {"internal": 1, "server": 2, "client": 3}
+
+
+class Span:
+    __slots__ = (
+        "trace_id", "span_id", "parent_id", "name", "kind",
+        "start_ns", "end_ns", "attributes", "error",
+    )
+
+    def __init__(self, trace_id: str, parent_id: Optional[str], name: str, kind: str, attributes: dict):
+        self.trace_id = trace_id
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.name = name
+        self.kind = kind
+        self.start_ns = time.time_ns()
+        self.end_ns = 0
+        self.attributes = attributes
+        self.error: Optional[str] = None
+
+    def set(self, **attributes) -> None:
+        self.attributes.update(attributes)
+
+    def to_dict(self) -> dict:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "kind": self.kind,
+            "start_ns": self.start_ns,
+            "end_ns": self.end_ns,
+            "duration_ms": round((self.end_ns - self.start_ns) / 1e6, 3),
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+
+_current: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar("trace_span", default=None)
+# In process-pool workers finished spans are collected here and returned to the parent
+_collector: contextvars.ContextVar[Optional[List[dict]]] = contextvars.ContextVar("trace_collector", default=None)
+
+_export_queue: "queue.Queue[dict]" = queue.Queue(maxsize=50000)
+_exporter: Optional[threading.Thread] = None
+_stop = threading.Event()
+
+
+def current_span() -> Optional[Span]:
+    return _current.get()
+
+
+def _finish(s: Span) -> None:
+    s.end_ns = time.time_ns()
+    record = s.to_dict()
+    collector = _collector.get()
+    if collector is not None:
+        collector.append(record)
+        return
+    try:
+        _export_queue.put_nowait(record)
+    except queue.Full:
+        metrics.inc("trace_spans_dropped_total")
+
+
+@contextmanager
+def _activate(s: Span):
+    token = _current.set(s)
+    try:
+        yield s
+    except BaseException as e:
+        s.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        _current.reset(token)
+        _finish(s)
+
+
+@contextmanager
+def span(name: str, kind: str = "internal", **attributes):
+    """Child span of the current one; a no-op (yields None) outside a sampled trace."""
+    parent = _current.get()
+    if parent is None:
+        yield None
+        return
+    with _activate(Span(parent.trace_id, parent.span_id, name, kind, attributes)) as s:
+        yield s
+
+
+@contextmanager
+def root_span(name: str, traceparent: Optional[str] = None, **attributes):
+    """Start a trace, honouring an incoming W3C `traceparent` header, else sampling at TRACE_SAMPLE_RATE."""
+    trace_id = parent_id = None
+    if traceparent:
+        parts = traceparent.split("-")
+        try:
+            valid = len(parts) == 4 and len(parts[1]) == 32 and len(parts[2]) == 16
+            sampled = valid and bool(int(parts[3], 16) & 1)
+        except ValueError:
+            valid = False
+        if valid:
+            if not sampled:  # caller decided not to sample
+                yield None
+                return
+            trace_id, parent_id = parts[1], parts[2]
+    if trace_id is None:
+        if random.random() >= settings.TRACE_SAMPLE_RATE:
+            yield None
+            return
+        trace_id = os.urandom(16).hex()
+    with _activate(Span(trace_id, parent_id, name, "server", attributes)) as s:
+        yield s
+
+
+def bind(fn: Callable, *args, **kwargs) -> Callable[[], object]:
+    """Callable running `fn` in a copy of the current context, for executors that do not copy it."""
+    context = contextvars.copy_context()
+    return lambda: context.run(fn, *args, **kwargs)
+
+
+# ---------------------------------------------------------------------------
+# Process-pool propagation
+# ---------------------------------------------------------------------------
+
+def inject() -> Optional[dict]:
+    """Picklable carrier for the current span, or None when not tracing."""
+    s = _current.get()
+    return None if s is None else {"trace_id": s.trace_id, "span_id": s.span_id}
+
+
+def run_remote(carrier: Optional[dict], name: str, fn: Callable, *args):
+    """Run `fn` in a worker process under a child span of `carrier`; return (result, finished spans)."""
+    if carrier is None:
+        return fn(*args), []
+    spans: List[dict] = []
+    parent = Span(carrier["trace_id"], None, "", "internal", {})
+    parent.span_id = carrier["span_id"]
+    collector_token = _collector.set(spans)
+    parent_token = _current.set(parent)
+    try:
+        with span(name, pid=os.getpid()):
+            result = fn(*args)
+    finally:
+        _current.reset(parent_token)
+        _collector.reset(collector_token)
+    return result, spans
+
+
+def record_spans(spans: List[dict]) -> None:
+    """Hand spans finished in another process to the exporter."""
+    for record in spans:
+        try:
+            _export_queue.put_nowait(record)
+        except queue.Full:
+            metrics.inc("trace_spans_dropped_total")
+
+
+# ---------------------------------------------------------------------------
+# Instrumentation
+# ---------------------------------------------------------------------------
+
+class TracingMiddleware:
+    """Pure ASGI middleware opening the request root span."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        traceparent = None
+        for key, value in scope.get("headers", ()):
+            if key == b"traceparent":
+                traceparent = value.decode("latin-1")
+                break
+        method = scope["method"]
+        with root_span(method, traceparent, **{"http.method": method, "http.target": scope["path"]}) as root:
+            if root is None:
+                await self.app(scope, receive, send)
+                return
+
+            async def send_wrapper(message):
+                if message["type"] == "http.response.start":
+                    root.set(**{"http.status_code": message["status"]})
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                route = getattr(scope.get("route"), "path", None)
+                if route:
+                    root.name = f"{method} {route}"
+                    root.set(**{"http.route": route})
+
+
+def instrument_engine(engine) -> None:
+    """Child spans around every SQL statement executed through `engine`."""
+    from sqlalchemy import event
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        parent = _current.get()
+        if parent is None:
+            return
+        s = Span(parent.trace_id, parent.span_id, "db.query", "client", {
+            "db.system": engine.dialect.name,
+            "db.statement": statement[:_STATEMENT_MAX_CHARS],
+            "db.executemany": executemany,
+        })
+        conn.info.setdefault("trace_spans", []).append(s)
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        stack = conn.info.get("trace_spans")
+        if stack:
+            s = stack.pop()
+            if cursor.rowcount is not None and cursor.rowcount >= 0:
+                s.set(**{"db.rowcount": cursor.rowcount})
+            _finish(s)
+
+    @event.listens_for(engine, "handle_error")
+    def _error(exception_context):
+        conn = exception_context.connection
+        stack = conn.info.get("trace_spans") if conn is not None else None
+        if stack:
+            s = stack.pop()
+            s.error = f"{type(exception_context.original_exception).__name__}: {exception_context.original_exception}"
+            _finish(s)
+
+
+# ---------------------------------------------------------------------------
+# Export
+# ---------------------------------------------------------------------------
+
+def _otlp_value(value) -> dict:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _otlp_payload(records: List[dict]) -> dict:
+    spans = []
+    for r in records:
+        otlp_span = {
+            "traceId": r["trace_id"],
+            "spanId": r["span_id"],
+            "name": r["name"],
+            "kind": _OTLP_KINDS.get(r["kind"], 1),
+            "startTimeUnixNano": str(r["start_ns"]),
+            "endTimeUnixNano": str(r["end_ns"]),
+            "attributes": [{"key": k, "value": _otlp_value(v)} for k, v in r["attributes"].items()],
+            "status": {"code": 2, "message": r["error"]} if r["error"] else {"code": 1},
+        }
+        if r["parent_id"]:
+            otlp_span["parentSpanId"] = r["parent_id"]
+        spans.append(otlp_span)
+    return {
+        "resourceSpans": [{
+            "resource": {"attributes": [
+                {"key": "service.name", "value": {"stringValue": settings.TRACE_SERVICE_NAME}},
+            ]},
+            "scopeSpans": [{"scope": {"name": "smarthire.tracing"}, "spans": spans}],
+        }]
+    }
+
+
+def _export(records: List[dict]) -> None:
+    if settings.TRACE_EXPORTER == "otlp":
+        request = urllib.request.Request(
+            settings.TRACE_OTLP_ENDPOINT,
+            data=json.dumps(_otlp_payload(records)).encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+        with urllib.request.urlopen(request, timeout=5):
+            pass
+    else:
+        path = Path(settings.TRACE_EXPORT_PATH)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "a", encoding="utf-8") as f:
+            f.write("".join(json.dumps(r) + "\n" for r in records))
+
+
+def _drain() -> List[dict]:
+    records = []
+    while len(records) < _EXPORT_BATCH:
+        try:
+            records.append(_export_queue.get_nowait())
+        except queue.Empty:
+            break
+    return records
+
+
+def _exporter_loop() -> None:
+    while True:
+        stopping = _stop.wait(settings.TRACE_EXPORT_INTERVAL_SECONDS)
+        while True:
+            records = _drain()
+            if not records:
+                break
+            try:
+                _export(records)
+                metrics.inc("trace_spans_exported_total", len(records))
+            except Exception as e:
+                metrics.inc("trace_spans_dropped_total", len(records))
+                logger.warning(f"Failed to export {len(records)} spans: {type(e).__name__}: {e}")
+        if stopping:
+            return
+
+
+def start() -> None:
+    global _exporter
+    if not settings.TRACE_ENABLED or _exporter is not None:
+        return
+    _stop.clear()
+    _exporter = threading.Thread(target=_exporter_loop, name="trace-exporter", daemon=True)
+    _exporter.start()
+
+
+def stop() -> None:
+    global _exporter
+    if _exporter is None:
+        return
+    _stop.set()
+    _exporter.join(timeout=10)
+    _exporter = None
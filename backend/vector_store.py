@@ -0,0 +1,426 @@
+#!/usr/bin/env python
+"""
+Memory-mapped on-disk store of TF-IDF resume vectors shared by all workers.
+
+Layout of VECTOR_STORE_DIR:
+
+    manifest.json            current generation, vocabulary id and live shards
+    vocab-<id>.terms/.offsets  sorted UTF-8 terms and their int64 byte offsets
+    vocab-<id>.idf           float32 idf per term (column index = sorted position)
+    <shard>.data             float32 CSR data (rows are L2-normalised)
+    <shard>.indices          int32 CSR column indices
+    <shard>.indptr           int32 CSR row pointers
+    <shard>.ids              fixed-width resume ids
+
+Every file is opened with `np.memmap`, so the OS page cache holds a single
+copy no matter how many uvicorn workers read it, and opening the store only
+parses the small manifest. The vocabulary is fitted on the first appended
+batch and reused afterwards (unseen terms are dropped), so rebuild the store
+when the corpus drifts. Uploaded resumes are appended as small shards, which
+are merged once there are more than VECTOR_STORE_MAX_SMALL_SHARDS of them;
+`compact()` merges everything into one and swaps the manifest atomically.
+Readers pick up new generations via `refresh()`. Files of retired shards and
+vocabularies are unlinked, which is safe while other processes still have
+them mapped (on Windows, where mapped files cannot be deleted, they are left
+for the next cleanup).
+
+CLI (from the backend folder):
+    python vector_store.py build      # (re)build from the resumes table
+    python vector_store.py compact
+"""
+import json
+import logging
+import math
+import os
+import threading
+import uuid
+from collections import Counter
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from ai_engine import tokenize
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+_ID_WIDTH = 36
+_MANIFEST = "manifest.json"
+
+
+class _Vocabulary:
+    """Sorted term list searched in place over mmap'd bytes; nothing is deserialized."""
+
+    def __init__(self, directory: str, vocab_id: str):
+        base = os.path.join(directory, f"vocab-{vocab_id}")
+        self.vocab_id = vocab_id
+        self._terms = np.memmap(f"{base}.terms", dtype=np.uint8, mode="r")
+        self._offsets = np.memmap(f"{base}.offsets", dtype=np.int64, mode="r")
+        self.idf = np.memmap(f"{base}.idf", dtype=np.float32, mode="r")
+        self.size = len(self._offsets) - 1
+        self.column = lru_cache(maxsize=65536)(self._column)
+
+    def _term(self, i: int) -> bytes:
+        return self._terms[self._offsets[i]:self._offsets[i + 1]].tobytes()
+
+    def _column(self, term: str) -> int:
+        key = term.encode("utf-8")
+        lo, hi = 0, self.size
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._term(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo if lo < self.size and self._term(lo) == key else -1
+
+    @staticmethod
+    def write(directory: str, terms: List[str], idf: np.ndarray) -> str:
+        # `terms` must be sorted (sklearn's get_feature_names_out already is) to line up with `idf`
+        vocab_id = uuid.uuid4().hex[:12]
+        base = os.path.join(directory, f"vocab-{vocab_id}")
+        encoded = [t.encode("utf-8") for t in terms]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(t) for t in encoded], out=offsets[1:])
+        _write_array(f"{base}.terms", np.frombuffer(b"".join(encoded), dtype=np.uint8))
+        _write_array(f"{base}.offsets", offsets)
+        _write_array(f"{base}.idf", idf.astype(np.float32))
+        return vocab_id
+
+
+class _Shard:
+    def __init__(self, directory: str, name: str, rows: int, n_features: int):
+        from scipy.sparse import csr_matrix
+
+        base = os.path.join(directory, name)
+        self.name = name
+        self.ids = np.memmap(f"{base}.ids", dtype=f"S{_ID_WIDTH}", mode="r") if rows else np.empty(0, f"S{_ID_WIDTH}")
+        indptr = np.memmap(f"{base}.indptr", dtype=np.int32, mode="r")
+        nnz = int(indptr[-1])
+        data = np.memmap(f"{base}.data", dtype=np.float32, mode="r") if nnz else np.empty(0, np.float32)
+        indices = np.memmap(f"{base}.indices", dtype=np.int32, mode="r") if nnz else np.empty(0, np.int32)
+        # int32 indices + int32 indptr keep scipy from up-casting (and copying) the maps
+        self.matrix = csr_matrix((data, indices, indptr), shape=(rows, n_features), copy=False)
+
+
+@contextmanager
+def file_lock(path: str):
+    """Exclusive lock on `path` across processes (flock, or msvcrt.locking on Windows)."""
+    with open(path, "a+") as fh:
+        if os.name == "nt":
+            import msvcrt
+
+            fh.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(fh.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:  # LK_LOCK gives up after ~10 s; keep waiting
+                    continue
+            try:
+                yield
+            finally:
+                fh.seek(0)
+                msvcrt.locking(fh.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+
+            fcntl.flock(fh, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(fh, fcntl.LOCK_UN)
+
+
+def _write_array(path: str, array: np.ndarray) -> None:
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as fh:
+        fh.write(np.ascontiguousarray(array).tobytes())
+        fh.flush()
+        os.fsync(fh.fileno())
+    os.replace(tmp_path, path)
+
+
+class VectorStore:
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.generation = -1
+        self._manifest_mtime: Optional[int] = None
+        self.vocab: Optional[_Vocabulary] = None
+        self.shards: List[_Shard] = []
+        self._lock = threading.Lock()
+        self.refresh()
+
+    # -- reading --------------------------------------------------------------
+
+    def _read_manifest(self) -> dict:
+        try:
+            with open(os.path.join(self.directory, _MANIFEST)) as fh:
+                return json.load(fh)
+        except FileNotFoundError:
+            return {"generation": 0, "vocab": None, "shards": []}
+
+    def refresh(self) -> None:
+        """Map shards added (and drop shards retired) since the last refresh."""
+        try:
+            mtime = os.stat(os.path.join(self.directory, _MANIFEST)).st_mtime_ns
+        except FileNotFoundError:
+            mtime = None
+        if mtime is not None and mtime == self._manifest_mtime:
+            return  # called on every match when the dense index checks its vocabulary
+        manifest = self._read_manifest()
+        with self._lock:
+            self._manifest_mtime = mtime
+            if manifest["generation"] == self.generation:
+                return
+            vocab_id = manifest.get("vocab")
+            if vocab_id is None:
+                self.vocab = None
+            elif self.vocab is None or self.vocab.vocab_id != vocab_id:
+                self.vocab = _Vocabulary(self.directory, vocab_id)
+            current = {s.name: s for s in self.shards} if self.vocab else {}
+            self.shards = [
+                current.get(s["name"]) or _Shard(self.directory, s["name"], s["rows"], self.vocab.size)
+                for s in manifest["shards"]
+            ]
+            self.generation = manifest["generation"]
+
+    @property
+    def n_rows(self) -> int:
+        return sum(s.matrix.shape[0] for s in self.shards)
+
+    def transform(self, texts: Iterable[str]):
+        """Vectorize texts against the stored vocabulary (sublinear tf * idf, L2-normalised)."""
+        from scipy.sparse import csr_matrix
+
+        data: List[float] = []
+        indices: List[int] = []
+        indptr = [0]
+        for text in texts:
+            row = {}
+            for term, count in Counter(tokenize(text)).items():
+                col = self.vocab.column(term)
+                if col >= 0:
+                    row[col] = (1.0 + math.log(count)) * float(self.vocab.idf[col])
+            norm = math.sqrt(sum(v * v for v in row.values())) or 1.0
+            for col in sorted(row):
+                indices.append(col)
+                data.append(row[col] / norm)
+            indptr.append(len(indices))
+        return csr_matrix(
+            (np.asarray(data, np.float32), np.asarray(indices, np.int32), np.asarray(indptr, np.int32)),
+            shape=(len(indptr) - 1, self.vocab.size),
+        )
+
+    def matrix(self):
+        """All rows as one CSR matrix (copies; meant for offline index builds)."""
+        from scipy.sparse import vstack
+
+        return vstack([s.matrix for s in self.shards], format="csr", dtype=np.float32)
+
+    def ids(self) -> List[str]:
+        return [i.decode("ascii") for s in self.shards for i in s.ids]
+
+    def top_k(self, text: str, k: int) -> List[Tuple[str, float]]:
+        """Exact cosine top-k across all shards without materialising the corpus."""
+        self.refresh()
+        if self.vocab is None:
+            return []
+        query = self.transform([text]).T.tocsc()
+        best: List[Tuple[float, str]] = []
+        for shard in self.shards:
+            scores = (shard.matrix @ query).toarray().ravel()
+            if not len(scores):
+                continue
+            top = np.argpartition(-scores, min(k, len(scores)) - 1)[:k]
+            best.extend((float(scores[i]), shard.ids[i].decode("ascii")) for i in top)
+        best.sort(reverse=True)
+        return [(rid, score) for score, rid in best[:k]]
+
+    # -- writing --------------------------------------------------------------
+
+    def _writer_lock(self):
+        os.makedirs(self.directory, exist_ok=True)
+        return file_lock(os.path.join(self.directory, ".lock"))
+
+    def _remove_files(self, names: Iterable[str]) -> None:
+        for name in names:
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                pass
+            except PermissionError:  # still mapped by a reader on Windows
+                pass
+
+    def _stale_files(self, manifest: dict) -> List[str]:
+        """Shard and vocabulary files not referenced by `manifest`."""
+        live = {s["name"] for s in manifest["shards"]}
+        if manifest.get("vocab"):
+            live.add(f"vocab-{manifest['vocab']}")
+        stale = []
+        for name in os.listdir(self.directory):
+            stem, _, ext = name.partition(".")
+            if (stem.startswith("shard-") or stem.startswith("vocab-")) and stem not in live and not ext.endswith("tmp"):
+                stale.append(name)
+        return stale
+
+    def _write_manifest(self, vocab_id: Optional[str], shards: List[dict]) -> None:
+        manifest = {
+            "generation": self._read_manifest()["generation"] + 1,
+            "vocab": vocab_id,
+            "shards": shards,
+        }
+        path = os.path.join(self.directory, _MANIFEST)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as fh:
+            json.dump(manifest, fh)
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp_path, path)
+
+    def _write_shard(self, ids: List[str], matrix) -> dict:
+        if matrix.nnz >= 2 ** 31:
+            raise ValueError("Shard too large for int32 indices; append in smaller batches.")
+        if any(len(i) > _ID_WIDTH for i in ids):
+            raise ValueError(f"Resume ids must be at most {_ID_WIDTH} characters.")
+        name = f"shard-{uuid.uuid4().hex[:12]}"
+        base = os.path.join(self.directory, name)
+        _write_array(f"{base}.data", matrix.data.astype(np.float32))
+        _write_array(f"{base}.indices", matrix.indices.astype(np.int32))
+        _write_array(f"{base}.indptr", matrix.indptr.astype(np.int32))
+        _write_array(f"{base}.ids", np.asarray(ids, dtype=f"S{_ID_WIDTH}"))
+        return {"name": name, "rows": len(ids), "nnz": int(matrix.nnz)}
+
+    def append(self, ids: List[str], texts: List[str], fit_vocab: bool = True) -> bool:
+        """Add one shard. The first append fits the vocabulary; later ones reuse it.
+
+        With `fit_vocab=False` nothing is written while the store has no
+        vocabulary yet (a single upload is no basis for one); returns whether
+        the rows were stored.
+        """
+        if not ids:
+            return False
+        with self._writer_lock():
+            manifest = self._read_manifest()
+            vocab_id = manifest.get("vocab")
+            if vocab_id is None and not fit_vocab:
+                return False
+            if vocab_id is None:
+                from sklearn.feature_extraction.text import TfidfVectorizer
+
+                fitted = TfidfVectorizer(analyzer=tokenize, sublinear_tf=True, dtype=np.float32).fit(texts)
+                vocab_id = _Vocabulary.write(
+                    self.directory, list(fitted.get_feature_names_out()), fitted.idf_
+                )
+            if self.vocab is None or self.vocab.vocab_id != vocab_id:
+                self.vocab = _Vocabulary(self.directory, vocab_id)
+            entry = self._write_shard(ids, self.transform(texts))
+            self._write_manifest(vocab_id, manifest["shards"] + [entry])
+        self.refresh()
+        if sum(s.matrix.shape[0] < settings.VECTOR_STORE_SHARD_ROWS for s in self.shards) > settings.VECTOR_STORE_MAX_SMALL_SHARDS:
+            self.compact(small_only=True)
+        return True
+
+    def compact(self, small_only: bool = False) -> None:
+        """Merge shards into one (only those under VECTOR_STORE_SHARD_ROWS rows with
+        `small_only`, so repeated uploads never rewrite the big shards), then retire
+        the old files."""
+        from scipy.sparse import vstack
+
+        with self._writer_lock():
+            self.refresh()
+            merge = [
+                s for s in self.shards
+                if not small_only or s.matrix.shape[0] < settings.VECTOR_STORE_SHARD_ROWS
+            ]
+            if len(merge) < 2:
+                return
+            ids = [i.decode("ascii") for s in merge for i in s.ids]
+            entry = self._write_shard(ids, vstack([s.matrix for s in merge], format="csr", dtype=np.float32))
+            merged = {s.name for s in merge}
+            kept = [s for s in self._read_manifest()["shards"] if s["name"] not in merged]
+            self._write_manifest(self.vocab.vocab_id, kept + [entry])
+            stale = self._stale_files(self._read_manifest())
+        self.refresh()
+        self._remove_files(stale)
+
+    def reset(self) -> None:
+        """Start over with an empty store; the next append fits a fresh vocabulary."""
+        with self._writer_lock():
+            self._write_manifest(None, [])
+            stale = self._stale_files(self._read_manifest())
+        self.refresh()
+        self._remove_files(stale)
+
+
+_store: Optional[VectorStore] = None
+_store_lock = threading.Lock()
+
+
+def get_vector_store() -> VectorStore:
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = VectorStore(settings.VECTOR_STORE_DIR)
+    _store.refresh()
+    return _store
+
+
+def add_resume(resume_id: str, resume_text: str) -> bool:
+    """Append an uploaded resume so the store does not go stale between builds."""
+    if not settings.VECTOR_STORE_ENABLED:
+        return False
+    if not get_vector_store().append([resume_id], [resume_text], fit_vocab=False):
+        logger.warning(
+            f"Resume {resume_id} not added to the vector store: it has no vocabulary yet. "
+            "Run `python vector_store.py build`."
+        )
+        return False
+    return True
+
+
+def transform_texts(texts: Iterable[str]):
+    """Module-level (picklable) vectorizer over the shared store, for models built from it."""
+    return get_vector_store().transform(texts)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Manage the on-disk resume vector store.")
+    parser.add_argument("command", choices=["build", "compact"])
+    args = parser.parse_args()
+
+    store = get_vector_store()
+    if args.command == "build":
+        from database import SessionLocal
+        import models
+
+        store.reset()
+        db = SessionLocal()
+        try:
+            batch_ids: List[str] = []
+            batch_texts: List[str] = []
+            query = db.query(models.Resume.id, models.Resume.resume_text).yield_per(1000)
+            for row in query:
+                batch_ids.append(row.id)
+                batch_texts.append(row.resume_text)
+                if len(batch_ids) >= settings.VECTOR_STORE_SHARD_ROWS:
+                    store.append(batch_ids, batch_texts)
+                    batch_ids, batch_texts = [], []
+            if batch_ids:
+                store.append(batch_ids, batch_texts)
+        finally:
+            db.close()
+        print(f"Stored {store.n_rows} resumes in {len(store.shards)} shard(s).")
+        if settings.DENSE_INDEX_ENABLED and store.n_rows:
+            # The old dense index was fitted on the previous vocabulary
+            import dense_index
+
+            stats = dense_index.build_dense_index_from_store().stats
+            print(f"Rebuilt dense index: {stats}")
+    else:
+        store.compact()
+        print(f"Compacted to {len(store.shards)} shard(s), {store.n_rows} resumes.")